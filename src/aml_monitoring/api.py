@@ -27,6 +27,7 @@ from aml_monitoring.rules import get_all_rules
 from aml_monitoring.rules.base import RuleContext
 from aml_monitoring.schemas import (
     ALERT_DISPOSITION_VALUES,
+    ALERT_LIST_ADAPTER,
     ALERT_STATUS_VALUES,
     AlertResponse,
     RuleHit,
@@ -440,8 +441,9 @@ def score_transaction(body: ScoreRequest) -> ScoreResponse:
     return ScoreResponse(
         risk_score=round(score, 2),
         band=band,
+        # RuleResults were validated when the rules built them; don't validate them twice.
         rule_hits=[
-            RuleHit(
+            RuleHit.model_construct(
                 rule_id=r.rule_id,
                 severity=r.severity,
                 reason=r.reason,
@@ -475,7 +477,7 @@ def list_alerts(
             stmt, session, id_column=Alert.id, cursor=cursor, limit=limit,
         )
         return {
-            "items": [AlertResponse.model_validate(a) for a in items],
+            "items": ALERT_LIST_ADAPTER.validate_python(items, from_attributes=True),
             "next_cursor": next_cursor,
         }
 
@@ -557,7 +559,7 @@ def get_transaction(transaction_id: int) -> TransactionResponse:
         ).scalar_one_or_none()
         if not txn:
             raise HTTPException(status_code=404, detail="Transaction not found")
-        alerts = [AlertResponse.model_validate(a) for a in txn.alerts]
+        alerts = ALERT_LIST_ADAPTER.validate_python(txn.alerts, from_attributes=True)
         return TransactionResponse(
             id=txn.id,
             account_id=txn.account_id,
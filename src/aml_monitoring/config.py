@@ -2,31 +2,76 @@
 
 from __future__ import annotations
 
+import copy
+import functools
 import hashlib
 import os
+from collections.abc import Mapping
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 
 import yaml  # type: ignore[import-untyped]
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+# libyaml-backed safe loader/dumper when PyYAML was built with it; same semantics as
+# yaml.safe_load / yaml.safe_dump.
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
 
-def _load_yaml(path: str | Path) -> dict[str, Any]:
+
+def _file_digest(path: str | Path) -> str | None:
+    """SHA256 of the file's bytes, or None if it does not exist. Unlike (mtime, size), a
+    same-size rewrite within one filesystem timestamp tick still changes it."""
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+@functools.lru_cache(maxsize=16)
+def _parse_yaml_file(path: str, digest: str) -> dict[str, Any]:
+    """Parse a YAML file; memoized per (path, content digest) so edits invalidate the entry."""
     with open(path, encoding="utf-8") as f:
-        return yaml.safe_load(f) or {}
+        return yaml.load(f, Loader=YAML_LOADER) or {}
+
+
+def _load_yaml(path: str | Path) -> dict[str, Any]:
+    """Return the parsed YAML at path (cached parse; callers get a private deep copy)."""
+    digest = _file_digest(path)
+    if digest is None:
+        raise FileNotFoundError(path)
+    return copy.deepcopy(_parse_yaml_file(str(path), digest))
 
 
-def _deep_merge(base: dict[str, Any], override: dict[str, Any]) -> dict[str, Any]:
+def _deep_merge(base: Mapping[str, Any], override: Mapping[str, Any]) -> dict[str, Any]:
+    """Merge override into base. Only dicts along the override spine are copied; every other
+    subtree is shared by reference with base/override (callers pass private copies)."""
     out = dict(base)
     for k, v in override.items():
-        if k in out and isinstance(out[k], dict) and isinstance(v, dict):
+        if k in out and isinstance(out[k], Mapping) and isinstance(v, Mapping):
             out[k] = _deep_merge(out[k], v)
         else:
             out[k] = v
     return out
 
 
+def _freeze(value: Any) -> Any:
+    """Recursively wrap dicts in read-only MappingProxyType views."""
+    if isinstance(value, Mapping):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Inverse of _freeze: a fresh, mutable nested dict."""
+    if isinstance(value, Mapping):
+        return {k: _thaw(v) for k, v in value.items()}
+    return value
+
+
 class AppSettings(BaseSettings):
     """App-level settings with env override."""
 
@@ -47,59 +92,106 @@ class AppSettings(BaseSettings):
 HIGH_RISK_COUNTRY_PLACEHOLDERS = frozenset({"XX", "YY"})
 
 
+@functools.lru_cache(maxsize=64)
+def _first_placeholder(countries: tuple[str, ...]) -> str | None:
+    """First placeholder code in countries (normalized as the rule does), or None."""
+    for c in countries:
+        code = c.strip().upper()[:3]
+        if code in HIGH_RISK_COUNTRY_PLACEHOLDERS:
+            return code
+    return None
+
+
 def validate_high_risk_country(config: dict[str, Any]) -> None:
-    """Raise ValueError if high_risk_country.countries contains placeholder XX or YY."""
+    """Raise ValueError if high_risk_country.countries contains placeholder XX or YY.
+    The scan is memoized per countries list, so repeated loads of one config cost a lookup."""
     rules = config.get("rules") or {}
     hrc = rules.get("high_risk_country") or {}
     if not hrc.get("enabled", True):
         return
     countries = hrc.get("countries") or []
-    for c in countries:
-        code = (c if isinstance(c, str) else str(c)).strip().upper()[:3]
-        if code in HIGH_RISK_COUNTRY_PLACEHOLDERS:
-            raise ValueError(
-                f"high_risk_country.countries must not contain placeholder {code!r}. "
-                "Replace with real ISO country codes (e.g. IR, KP, SY) in config or dev/tuned override."
-            )
-
-
-def get_config(config_path: str | None = None) -> dict[str, Any]:
-    """Load merged config from YAML and apply env overrides via AppSettings."""
-    settings = AppSettings()
-    path = config_path or settings.config_path
-    if not Path(path).exists():
-        cfg = _default_config()
-        validate_high_risk_country(cfg)
-        return cfg
+    code = _first_placeholder(tuple(c if isinstance(c, str) else str(c) for c in countries))
+    if code is not None:
+        raise ValueError(
+            f"high_risk_country.countries must not contain placeholder {code!r}. "
+            "Replace with real ISO country codes (e.g. IR, KP, SY) in config or dev/tuned override."
+        )
+
+
+@functools.lru_cache(maxsize=32)
+def _resolve_config(
+    path: str,
+    merge_dev: bool,
+    files_key: tuple[str | None, ...],
+    db_url: str | None,
+    log_level: str | None,
+    aml_env: str | None,
+) -> dict[str, Any]:
+    """Merge + override + validate for an existing config file. Memoized: files_key holds the
+    content digests of the base, dev and tuned files, so editing any of them is a cache miss."""
     base = _load_yaml(path)
     config_dir = Path(path).parent
-    if "default" in path or path == "config/default.yaml":
+    if merge_dev:
         dev_path = config_dir / "dev.yaml"
-        if dev_path.exists() and os.environ.get("AML_ENV") == "dev":
+        if dev_path.exists() and aml_env == "dev":
             base = _deep_merge(base, _load_yaml(str(dev_path)))
     tuned_path = config_dir / "tuned.yaml"
     if tuned_path.exists():
         base = _deep_merge(base, _load_yaml(str(tuned_path)))
-    # Env overrides (DATABASE_URL standard for Docker/Postgres; AML_DATABASE_URL for app)
-    db_url = os.environ.get("DATABASE_URL") or settings.database_url
     if db_url:
         base.setdefault("database", {})["url"] = db_url
-    if settings.log_level:
-        base.setdefault("app", {})["log_level"] = settings.log_level
+    if log_level:
+        base.setdefault("app", {})["log_level"] = log_level
     validate_high_risk_country(base)
     return base
 
 
-def _default_config() -> dict[str, Any]:
-    return {
-        "app": {"name": "aml-monitoring", "env": "default", "log_level": "INFO"},
-        "database": {"url": "sqlite:///./data/aml.db", "echo": False},
-        "ingest": {"csv_encoding": "utf-8", "batch_size": 500},
-        "rules": {},
-        "scoring": {"base_risk_per_customer": 10, "max_score": 100},
-        "reporting": {"output_dir": "./reports"},
-        "api": {"host": "127.0.0.1", "port": 8000},
-    }
+def _clear_cache() -> None:
+    """Drop memoized config parses and resolved configs (for tests that count cache hits)."""
+    _resolve_config.cache_clear()
+    _parse_yaml_file.cache_clear()
+
+
+def get_config(config_path: str | None = None) -> dict[str, Any]:
+    """Load merged config from YAML and apply env overrides via AppSettings.
+    Resolved configs are cached per (abspath, file content digests, env overrides); each call
+    returns a private deep copy."""
+    settings = AppSettings()
+    path = config_path or settings.config_path
+    files_key = (_file_digest(path),)
+    if files_key[0] is None:
+        cfg = _thaw(_default_config())
+        validate_high_risk_country(cfg)
+        return cfg
+    config_dir = Path(path).parent
+    files_key += (_file_digest(config_dir / "dev.yaml"), _file_digest(config_dir / "tuned.yaml"))
+    # Env overrides (DATABASE_URL standard for Docker/Postgres; AML_DATABASE_URL for app)
+    db_url = os.environ.get("DATABASE_URL") or settings.database_url
+    resolved = _resolve_config(
+        os.path.abspath(path),
+        "default" in path or path == "config/default.yaml",
+        files_key,
+        db_url,
+        settings.log_level,
+        os.environ.get("AML_ENV"),
+    )
+    return copy.deepcopy(resolved)
+
+
+@functools.lru_cache(maxsize=1)
+def _default_config() -> Mapping[str, Any]:
+    """Built-in defaults, built once and deep-frozen; use _thaw() for a mutable copy."""
+    return _freeze(
+        {
+            "app": {"name": "aml-monitoring", "env": "default", "log_level": "INFO"},
+            "database": {"url": "sqlite:///./data/aml.db", "echo": False},
+            "ingest": {"csv_encoding": "utf-8", "batch_size": 5000},
+            "rules": {},
+            "scoring": {"base_risk_per_customer": 10, "max_score": 100},
+            "reporting": {"output_dir": "./reports"},
+            "api": {"host": "127.0.0.1", "port": 8000},
+        }
+    )
 
 
 def get_config_hash(config: dict[str, Any]) -> str:
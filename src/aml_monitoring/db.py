@@ -9,8 +9,10 @@ from collections.abc import Generator
 from contextlib import contextmanager
 from logging import getLogger
 
-from sqlalchemy import create_engine, select, text
+from sqlalchemy import create_engine, make_url, select, text
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.util import asbool
 
 from aml_monitoring.models import AuditLog, Base
 
@@ -21,6 +23,9 @@ _engine = None
 _SessionLocal: sessionmaker[Session] | None = None
 
 _IS_SQLITE = False
+# (url, echo, engine) of the last init_db that completed its schema work; a repeat call
+# for the same URL while that engine is still bound is a no-op.
+_initialized: tuple[str, bool, object] | None = None
 
 _SCHEMA_COLUMNS = (
     (
@@ -55,22 +60,68 @@ _SCHEMA_COLUMNS = (
 )
 
 
-def _get_existing_columns(conn, table: str) -> set[str]:
-    """Return set of column names for table (SQLite pragma_table_info)."""
-    r = conn.execute(text(f"PRAGMA table_info({table})"))
-    return {row[1] for row in r.fetchall()}
+# File-backed SQLite: WAL lets readers run alongside the ingest writer, and NORMAL sync
+# fsyncs at checkpoints rather than on every commit (still crash-safe in WAL mode).
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+)
+
+# Durability trade-offs for throwaway test DBs only; enabled via AML_TEST_FAST_PRAGMAS=1.
+_FAST_SQLITE_PRAGMAS = (
+    "PRAGMA synchronous=OFF",
+    "PRAGMA journal_mode=MEMORY",
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+def _apply_fast_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Connect hook: skip fsync and keep journal/temp tables in memory (disposable DBs)."""
+    cursor = dbapi_connection.cursor()
+    for pragma in _FAST_SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Connect hook: WAL journal, NORMAL sync, in-memory temp tables, 64 MiB page cache."""
+    cursor = dbapi_connection.cursor()
+    for pragma in _SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
+def _existing_columns(conn) -> dict[str, set[str]]:
+    """Return {table: column names} for every SQLite table in one query (pragma_table_info)."""
+    rows = conn.execute(
+        text(
+            "SELECT m.name, p.name FROM sqlite_master AS m "
+            "JOIN pragma_table_info(m.name) AS p WHERE m.type = 'table'"
+        )
+    )
+    existing: dict[str, set[str]] = {}
+    for table, column in rows:
+        existing.setdefault(table, set()).add(column)
+    return existing
+
+
+def _missing_in(conn) -> list[tuple[str, str, str]]:
+    """(table, column, type) expected by _SCHEMA_COLUMNS but absent on conn's database."""
+    existing = _existing_columns(conn)
+    return [
+        (table, col_name, col_type)
+        for table, columns in _SCHEMA_COLUMNS
+        for col_name, col_type in columns
+        if col_name not in existing.get(table, ())
+    ]
 
 
 def _missing_columns(engine) -> list[tuple[str, str]]:
     """Return list of (table, column) that are expected but missing."""
-    missing: list[tuple[str, str]] = []
     with engine.connect() as conn:
-        for table, columns in _SCHEMA_COLUMNS:
-            existing = _get_existing_columns(conn, table)
-            for col_name, _ in columns:
-                if col_name not in existing:
-                    missing.append((table, col_name))
-    return missing
+        return [(table, col_name) for table, col_name, _ in _missing_in(conn)]
 
 
 def _audit_row_canonical(row: AuditLog) -> str:
@@ -97,28 +148,23 @@ def _compute_audit_chain(session: Session) -> None:
         prev_hash = row.row_hash
 
 
-def _upgrade_schema(engine) -> list[tuple[str, str]]:
-    """Add audit/reproducibility columns if missing (SQLite). Returns list of (table, column) added."""
+def _upgrade_schema(conn) -> list[tuple[str, str]]:
+    """Add audit/reproducibility columns if missing (SQLite). Returns list of (table, column) added.
+    All ALTERs run in one explicit transaction (pysqlite does not BEGIN before DDL by itself);
+    a failing ALTER only aborts its own statement, so the others still commit together."""
+    missing = _missing_in(conn)
+    if not missing:
+        return []
     added: list[tuple[str, str]] = []
-    with engine.connect() as conn:
-        for table, columns in _SCHEMA_COLUMNS:
-            existing = _get_existing_columns(conn, table)
-            for col_name, col_type in columns:
-                if col_name in existing:
-                    continue
-                try:
-                    if table == "alerts" and col_name == "status":
-                        conn.execute(
-                            text(
-                                f"ALTER TABLE {table} ADD COLUMN {col_name} {col_type} DEFAULT 'open'"
-                            )
-                        )
-                    else:
-                        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {col_name} {col_type}"))
-                    conn.commit()
-                    added.append((table, col_name))
-                except Exception:
-                    conn.rollback()
+    conn.exec_driver_sql("BEGIN")
+    for table, col_name, col_type in missing:
+        default = " DEFAULT 'open'" if table == "alerts" and col_name == "status" else ""
+        try:
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {col_name} {col_type}{default}"))
+        except Exception:
+            continue
+        added.append((table, col_name))
+    conn.commit()
     if added:
         logger.warning(
             "Schema auto-upgrade ran (AML_ALLOW_SCHEMA_UPGRADE=true). Columns added: %s", added
@@ -126,37 +172,72 @@ def _upgrade_schema(engine) -> list[tuple[str, str]]:
     return added
 
 
-def init_db(database_url: str, echo: bool = False) -> None:
-    """Create engine and session factory. Call once at startup.
-    SQLite: create_all + optional schema upgrade gating. Postgres: engine only (schema via Alembic).
-    """
+def _before_flush_audit_chain(session, flush_context, instances) -> None:
+    _compute_audit_chain(session)
+
+
+def bind_engine(database_url: str, echo: bool = False) -> None:
+    """Create engine and session factory without any DDL or schema checks.
+    For databases whose schema is already in place (e.g. a copy of an init_db'd SQLite file);
+    init_db calls this first, then creates/validates the schema."""
     global _engine, _SessionLocal, _IS_SQLITE
-    _IS_SQLITE = "sqlite" in database_url
+    # Backend from the parsed URL, so "sqlite" elsewhere in a URL (db name, password) cannot
+    # put a Postgres engine on the SQLite connect args and pragma hooks.
+    url = make_url(database_url)
+    _IS_SQLITE = url.get_backend_name() == "sqlite"
     connect_args = {} if not _IS_SQLITE else {"check_same_thread": False}
+    engine_kwargs: dict = {}
+    if _IS_SQLITE and url.query.get("mode") == "memory" and asbool(url.query.get("uri")):
+        # Named in-memory DB (sqlite:///file:<name>?mode=memory&cache=shared&uri=true):
+        # one shared connection so every session sees the same data; lives as long as the engine.
+        # Checked on the parsed query, so "mode=memory" in a file path does not match.
+        connect_args["uri"] = True
+        engine_kwargs["poolclass"] = StaticPool
     _engine = create_engine(
         database_url,
         echo=echo,
         connect_args=connect_args,
+        **engine_kwargs,
     )
-    _SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=_engine)
     from sqlalchemy import event
 
-    @event.listens_for(Session, "before_flush")
-    def _before_flush_audit_chain(session, flush_context, instances):
-        _compute_audit_chain(session)
+    if _IS_SQLITE and os.environ.get("AML_TEST_FAST_PRAGMAS", "").strip() == "1":
+        event.listen(_engine, "connect", _apply_fast_sqlite_pragmas)
+    elif _IS_SQLITE:
+        # In-memory databases ignore journal_mode=WAL and keep their own journal.
+        event.listen(_engine, "connect", _apply_sqlite_pragmas)
+    _SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=_engine)
+
+    # Session-class listener: register once, however many times the engine is rebound.
+    if not event.contains(Session, "before_flush", _before_flush_audit_chain):
+        event.listen(Session, "before_flush", _before_flush_audit_chain)
+
 
+def init_db(database_url: str, echo: bool = False) -> None:
+    """Create engine and session factory. Call once at startup.
+    SQLite: create_all + optional schema upgrade gating. Postgres: engine only (schema via Alembic).
+    Repeat calls for the URL already initialized (engine still bound) return immediately.
+    """
+    global _initialized
+    if _initialized == (database_url, echo, _engine) and _engine is not None:
+        return
+    bind_engine(database_url, echo=echo)
     if _IS_SQLITE:
-        Base.metadata.create_all(bind=_engine)
         allow_upgrade = os.environ.get("AML_ALLOW_SCHEMA_UPGRADE", "").strip().lower() == "true"
-        if allow_upgrade:
-            _upgrade_schema(_engine)
-        else:
-            missing = _missing_columns(_engine)
-            if missing:
+        # One connection for DDL, the column check and any upgrade.
+        with _engine.connect() as conn:
+            Base.metadata.create_all(bind=conn)
+            conn.commit()
+            if allow_upgrade:
+                _upgrade_schema(conn)
+            elif _missing_in(conn):
                 raise RuntimeError(
                     "Schema mismatch detected. Set AML_ALLOW_SCHEMA_UPGRADE=true for local dev OR run migrations."
                 )
     # Postgres: schema is applied via Alembic (migrate target); do not create_all here
+    # A plain :memory: URL means a new private database per engine; never treat it as done.
+    if make_url(database_url).database not in (None, "", ":memory:"):
+        _initialized = (database_url, echo, _engine)
 
 
 def get_engine():
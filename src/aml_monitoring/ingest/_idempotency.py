@@ -1,18 +1,44 @@
-"""Deterministic external_id for idempotent ingestion."""
+"""Deterministic external_id, get-or-insert helpers and batch sizing for idempotent ingestion."""
 
 from __future__ import annotations
 
 import hashlib
+import io
 from datetime import UTC, datetime
 from decimal import Decimal
 
+from sqlalchemy import select
+from sqlalchemy.dialects import sqlite
+
+from aml_monitoring.models import Account, Customer, Transaction
+
+_CENT = Decimal("0.01")
+
+# Rows after which a single-transaction ingest commits and continues (bounds journal size).
+COMMIT_EVERY_ROWS = 50_000
+# Rows per INSERT batch when neither the caller nor config ingest.batch_size sets one.
+DEFAULT_BATCH_SIZE = 5_000
+
+# Max binds per IN (...) lookup, under SQLite's 999-variable limit on builds before 3.32.
+_IN_CHUNK_SIZE = 900
+
+# Session-local staging table for the Postgres COPY path; rows are cleared after each batch.
+_PG_STAGE_TABLE = "_ingest_transactions_stage"
+
 
 def _ts_utc_iso(ts: datetime) -> str:
     """Canonical UTC ISO string (naive treated as UTC)."""
+    if ts.tzinfo is UTC:
+        return ts.isoformat()
     ts = ts.astimezone(UTC) if ts.tzinfo is not None else ts.replace(tzinfo=UTC)
     return ts.isoformat()
 
 
+def resolve_batch_size(batch_size: int | None, ingest_cfg: dict) -> int:
+    """Rows per INSERT batch: the caller's batch_size, else config ingest.batch_size."""
+    return batch_size or int(ingest_cfg.get("batch_size", DEFAULT_BATCH_SIZE))
+
+
 def compute_external_id(
     account_id: int,
     ts: datetime,
@@ -25,20 +51,11 @@ def compute_external_id(
     SHA256 of canonical (account_id, ts_utc_iso, amount_2dp, currency_upper,
     counterparty_lower, direction_lower). Stable across whitespace/casing.
     """
-    ts_str = _ts_utc_iso(ts)
-    amount_canon = str(Decimal(str(amount)).quantize(Decimal("0.01")))
-    currency_canon = (currency or "").strip().upper()
-    counterparty_canon = (counterparty or "").strip().lower()
-    direction_canon = (direction or "").strip().lower()
-    parts = (
-        str(account_id),
-        ts_str,
-        amount_canon,
-        currency_canon,
-        counterparty_canon,
-        direction_canon,
+    payload = (
+        f"{account_id}|{_ts_utc_iso(ts)}|{Decimal(str(amount)).quantize(_CENT)}|"
+        f"{(currency or '').strip().upper()}|{(counterparty or '').strip().lower()}|"
+        f"{(direction or '').strip().lower()}"
     )
-    payload = "|".join(parts)
     return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
 
@@ -60,3 +77,98 @@ def external_id_for_row(
         if s and len(s) <= 64:
             return s
     return compute_external_id(account_id, ts, amount, currency, counterparty, direction)
+
+
+def insert_new_transactions(session, rows: list[dict]) -> int:
+    """
+    Insert transaction rows in one executemany (one COPY on Postgres), skipping any whose
+    external_id already exists (ON CONFLICT DO NOTHING on the unique column).
+    Returns rows actually inserted.
+    """
+    if not rows:
+        return 0
+    if session.get_bind().dialect.name == "postgresql":
+        return _copy_new_transactions(session, rows)
+    # Core INSERT on the Table, not the mapped class: the ORM bulk-insert layer would walk every
+    # row through its persistence machinery before the same executemany.
+    table = Transaction.__table__
+    stmt = (
+        sqlite.insert(table)
+        .on_conflict_do_nothing(index_elements=[table.c.external_id])
+        .returning(table.c.id)
+    )
+    return len(session.execute(stmt, rows).all())
+
+
+def _copy_field(value) -> str:
+    """One COPY ... (FORMAT csv) field: NULL stays unquoted and empty, everything else quoted."""
+    if value is None:
+        return ""
+    text_value = value.isoformat() if isinstance(value, datetime) else str(value)
+    return '"' + text_value.replace('"', '""') + '"'
+
+
+def _copy_new_transactions(session, rows: list[dict]) -> int:
+    """
+    Postgres path for insert_new_transactions: COPY the batch into a temp staging table,
+    then INSERT ... SELECT ... ON CONFLICT (external_id) DO NOTHING into transactions.
+    Runs on the session's connection, so it shares the caller's transaction.
+    """
+    columns = list(rows[0])
+    column_list = ", ".join(columns)
+    buf = io.StringIO()
+    for row in rows:
+        buf.write(",".join(_copy_field(row[c]) for c in columns))
+        buf.write("\n")
+    buf.seek(0)
+    conn = session.connection()
+    conn.exec_driver_sql(
+        f"CREATE TEMP TABLE IF NOT EXISTS {_PG_STAGE_TABLE} AS "
+        f"SELECT {column_list} FROM transactions WITH NO DATA"
+    )
+    cursor = conn.connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {_PG_STAGE_TABLE} ({column_list}) FROM STDIN WITH (FORMAT csv)", buf
+        )
+    finally:
+        cursor.close()
+    inserted = conn.exec_driver_sql(
+        f"INSERT INTO transactions ({column_list}) SELECT {column_list} FROM {_PG_STAGE_TABLE} "
+        "ON CONFLICT (external_id) DO NOTHING RETURNING id"
+    ).all()
+    conn.exec_driver_sql(f"TRUNCATE {_PG_STAGE_TABLE}")
+    return len(inserted)
+
+
+def ensure_accounts(session, batch: list[dict]) -> dict[str, int]:
+    """
+    Map each iban_or_acct in a batch of canonical rows to its account id, creating the
+    missing Customer/Account pairs (from the first row naming them) with a single flush.
+    One SELECT per _IN_CHUNK_SIZE accounts instead of one get-or-create round trip per row.
+    """
+    first_row: dict[str, dict] = {}
+    for b in batch:
+        first_row.setdefault(b["iban_or_acct"], b)
+    ibans = list(first_row)
+    ids: dict[str, int] = {}
+    for i in range(0, len(ibans), _IN_CHUNK_SIZE):
+        stmt = select(Account.iban_or_acct, Account.id).where(
+            Account.iban_or_acct.in_(ibans[i : i + _IN_CHUNK_SIZE])
+        )
+        ids.update(session.execute(stmt).all())
+    new_accounts = {
+        iban: Account(
+            customer=Customer(
+                name=b["customer_name"], country=b["country"], base_risk=b["base_risk"]
+            ),
+            iban_or_acct=iban,
+        )
+        for iban, b in first_row.items()
+        if iban not in ids
+    }
+    if new_accounts:
+        session.add_all(new_accounts.values())
+        session.flush()
+        ids.update((iban, account.id) for iban, account in new_accounts.items())
+    return ids
@@ -7,14 +7,18 @@ import time
 from datetime import datetime
 from pathlib import Path
 
-from sqlalchemy import select
-
 from aml_monitoring import ENGINE_VERSION, RULES_VERSION
 from aml_monitoring.audit_context import get_actor, get_correlation_id
 from aml_monitoring.config import get_config, get_config_hash
 from aml_monitoring.db import session_scope
-from aml_monitoring.ingest._idempotency import compute_external_id
-from aml_monitoring.models import Account, AuditLog, Customer, Transaction
+from aml_monitoring.ingest._idempotency import (
+    COMMIT_EVERY_ROWS,
+    compute_external_id,
+    ensure_accounts,
+    insert_new_transactions,
+    resolve_batch_size,
+)
+from aml_monitoring.models import AuditLog
 
 
 def _parse_ts(s: str) -> datetime:
@@ -34,36 +38,51 @@ def _parse_ts(s: str) -> datetime:
     raise ValueError(f"Cannot parse datetime: {s!r}")
 
 
-def _ensure_customer_and_account(
-    session, customer_name: str, country: str, iban_or_acct: str, base_risk: float
-) -> int:
-    from sqlalchemy import select
-
-    stmt = select(Account).where(Account.iban_or_acct == iban_or_acct)
-    row = session.execute(stmt).scalar_one_or_none()
-    if row:
-        return int(row.id)
-    customer = Customer(
-        name=customer_name,
-        country=country,
-        base_risk=base_risk,
-    )
-    session.add(customer)
-    session.flush()
-    account = Account(customer_id=customer.id, iban_or_acct=iban_or_acct)
-    session.add(account)
-    session.flush()
-    return int(account.id)
+def _process_batch(session, batch: list[dict]) -> int:
+    """Deduplicate a batch by external_id and insert it with one executemany INSERT.
+    Returns rows inserted; the caller owns the transaction."""
+    rows: list[dict] = []
+    seen: set[str] = set()
+    account_ids = ensure_accounts(session, batch)
+    for b in batch:
+        account_id = account_ids[b["iban_or_acct"]]
+        external_id = compute_external_id(
+            account_id,
+            b["ts"],
+            b["amount"],
+            b["currency"],
+            b["counterparty"],
+            b["direction"],
+        )
+        if external_id in seen:
+            continue
+        seen.add(external_id)
+        rows.append(
+            {
+                "external_id": external_id,
+                "account_id": account_id,
+                "ts": b["ts"],
+                "amount": b["amount"],
+                "currency": b["currency"],
+                "merchant": b["merchant"],
+                "counterparty": b["counterparty"],
+                "country": b["country_txn"],
+                "channel": b["channel"],
+                "direction": b["direction"],
+            }
+        )
+    return insert_new_transactions(session, rows)
 
 
 def ingest_jsonl(
     filepath: str | Path,
-    batch_size: int = 500,
+    batch_size: int | None = None,
     config_path: str | None = None,
 ) -> tuple[int, int]:
     """
     Idempotent ingest: JSONL with customer_name, country, iban_or_acct, ts, amount, etc.
     Uses external_id (deterministic hash) to skip duplicates.
+    batch_size (rows per INSERT batch) defaults to config ingest.batch_size.
     Returns (lines_read, rows_inserted). Writes audit log with config_hash, duration.
     """
     path = Path(filepath)
@@ -71,6 +90,8 @@ def ingest_jsonl(
         raise FileNotFoundError(str(path))
     config = get_config(config_path)
     config_hash = get_config_hash(config)
+    ingest_cfg = config.get("ingest") or {}
+    batch_size = resolve_batch_size(batch_size, ingest_cfg)
     start = time.perf_counter()
     lines_read = 0
     rows_inserted = 0
@@ -78,7 +99,9 @@ def ingest_jsonl(
     reject_reasons: list[str] = []
     max_reject_reasons = 500
 
-    with open(path, encoding="utf-8") as f:
+    # One transaction for the whole file (one commit/fsync), split only for very large inputs.
+    uncommitted = 0
+    with open(path, encoding="utf-8") as f, session_scope() as session:
         batch: list[dict] = []
         for line in f:
             line = line.strip()
@@ -126,103 +149,27 @@ def ingest_jsonl(
                 }
             )
             if len(batch) >= batch_size:
-                with session_scope() as session:
-                    seen_in_batch: set[str] = set()
-                    for b in batch:
-                        account_id = _ensure_customer_and_account(
-                            session,
-                            b["customer_name"],
-                            b["country"],
-                            b["iban_or_acct"],
-                            b["base_risk"],
-                        )
-                        external_id = compute_external_id(
-                            account_id,
-                            b["ts"],
-                            b["amount"],
-                            b["currency"],
-                            b["counterparty"],
-                            b["direction"],
-                        )
-                        if (
-                            external_id in seen_in_batch
-                            or session.execute(
-                                select(Transaction.id).where(Transaction.external_id == external_id)
-                            ).first()
-                        ):
-                            continue
-                        seen_in_batch.add(external_id)
-                        t = Transaction(
-                            external_id=external_id,
-                            account_id=account_id,
-                            ts=b["ts"],
-                            amount=b["amount"],
-                            currency=b["currency"],
-                            merchant=b["merchant"],
-                            counterparty=b["counterparty"],
-                            country=b["country_txn"],
-                            channel=b["channel"],
-                            direction=b["direction"],
-                        )
-                        session.add(t)
-                        rows_inserted += 1
+                rows_inserted += _process_batch(session, batch)
+                uncommitted += len(batch)
                 batch = []
-
-    if batch:
-        with session_scope() as session:
-            seen_residual: set[str] = set()
-            for b in batch:
-                account_id = _ensure_customer_and_account(
-                    session,
-                    b["customer_name"],
-                    b["country"],
-                    b["iban_or_acct"],
-                    b["base_risk"],
-                )
-                external_id = compute_external_id(
-                    account_id,
-                    b["ts"],
-                    b["amount"],
-                    b["currency"],
-                    b["counterparty"],
-                    b["direction"],
-                )
-                if (
-                    external_id in seen_residual
-                    or session.execute(
-                        select(Transaction.id).where(Transaction.external_id == external_id)
-                    ).first()
-                ):
-                    continue
-                seen_residual.add(external_id)
-                t = Transaction(
-                    external_id=external_id,
-                    account_id=account_id,
-                    ts=b["ts"],
-                    amount=b["amount"],
-                    currency=b["currency"],
-                    merchant=b["merchant"],
-                    counterparty=b["counterparty"],
-                    country=b["country_txn"],
-                    channel=b["channel"],
-                    direction=b["direction"],
-                )
-                session.add(t)
-                rows_inserted += 1
-
-    duration = time.perf_counter() - start
-    details: dict = {
-        "rows_read": lines_read,
-        "rows_inserted": rows_inserted,
-        "duration_seconds": round(duration, 3),
-        "config_hash": config_hash,
-        "rules_version": RULES_VERSION,
-        "engine_version": ENGINE_VERSION,
-    }
-    if rows_rejected:
-        details["rows_rejected"] = rows_rejected
-        details["reject_reasons"] = reject_reasons
-    with session_scope() as session:
+                if uncommitted >= COMMIT_EVERY_ROWS:
+                    session.commit()
+                    uncommitted = 0
+        if batch:
+            rows_inserted += _process_batch(session, batch)
+        duration = time.perf_counter() - start
+        details: dict = {
+            "rows_read": lines_read,
+            "rows_inserted": rows_inserted,
+            "duration_seconds": round(duration, 3),
+            "config_hash": config_hash,
+            "rules_version": RULES_VERSION,
+            "engine_version": ENGINE_VERSION,
+        }
+        if rows_rejected:
+            details["rows_rejected"] = rows_rejected
+            details["reject_reasons"] = reject_reasons
+        # Audit row commits with the data it describes (no second transaction).
         session.add(
             AuditLog(
                 correlation_id=get_correlation_id(),
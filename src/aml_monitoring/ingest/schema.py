@@ -10,6 +10,7 @@ from __future__ import annotations
 
 import json
 import re
+from collections.abc import Callable
 from datetime import datetime
 from pathlib import Path
 from typing import Any
@@ -219,6 +220,26 @@ def infer_column_map(
     return result
 
 
+# Digit runs of "YYYY-MM-DD[T ]HH:MM:SS"; separators are checked separately.
+_ISO_DIGIT_SPANS = ((0, 4), (5, 7), (8, 10), (11, 13), (14, 16), (17, 19))
+
+
+def _is_plain_iso_datetime(s: str) -> bool:
+    """True only for exactly "YYYY-MM-DD[T ]HH:MM:SS" in ASCII digits.
+
+    fromisoformat also takes week dates, ordinal dates and offsets that the strptime formats
+    reject, so the fast path must not see anything else.
+    """
+    return (
+        len(s) == 19
+        and s.isascii()
+        and s[4] == s[7] == "-"
+        and s[10] in "T "
+        and s[13] == s[16] == ":"
+        and all(s[a:b].isdigit() for a, b in _ISO_DIGIT_SPANS)
+    )
+
+
 def _parse_ts(s: str | datetime | int | float) -> datetime:
     if isinstance(s, datetime):
         return s
@@ -234,6 +255,15 @@ def _parse_ts(s: str | datetime | int | float) -> datetime:
     s = raw.replace("Z", "").replace("z", "").strip()
     # Strip fractional seconds so we can try without .%f first
     s_no_fraction = s.split(".")[0] if "." in s and "T" in s else s
+    # Common zero-padded "YYYY-MM-DD[T ]HH:MM:SS": C fromisoformat instead of the strptime loop.
+    if _is_plain_iso_datetime(s_no_fraction):
+        try:
+            dt = datetime.fromisoformat(s_no_fraction)
+        except ValueError:
+            pass
+        else:
+            if dt.tzinfo is None:
+                return dt
     formats = [
         "%Y-%m-%dT%H:%M:%S",
         "%Y-%m-%d %H:%M:%S",
@@ -275,6 +305,93 @@ def _risk_band_to_base_risk(v: Any) -> float:
         return 10.0
 
 
+def row_normalizer(
+    column_map: dict[str, str],
+) -> Callable[[dict[str, Any]], tuple[dict[str, Any], str | None]]:
+    """
+    Return normalize_row specialised to one column_map, for per-file ingest loops:
+    the map's items and the minor-units check are resolved once, not per row.
+    """
+    items = tuple(column_map.items())
+    # If amount comes from a "minor units" column (e.g. cents), convert to major units
+    minor_units = any("minor" in k.lower() for k, v in items if v == "amount")
+
+    def _normalize(row: dict[str, Any]) -> tuple[dict[str, Any], str | None]:
+        # Map external key -> value for canonical key
+        canonical_raw: dict[str, Any] = {}
+        external_id_override: str | None = None
+
+        for external_key, canonical_key in items:
+            if external_key not in row:
+                continue
+            val = row[external_key]
+            if val is None or (isinstance(val, str) and not val.strip()):
+                continue
+            canonical_raw[canonical_key] = val
+
+        # Apply type coercion and defaults
+        out: dict[str, Any] = {}
+
+        # Required
+        iban = canonical_raw.get("iban_or_acct") or ""
+        out["iban_or_acct"] = str(iban).strip() if iban else ""
+        ts_val = canonical_raw.get("ts")
+        if ts_val is None or (isinstance(ts_val, str) and not str(ts_val).strip()):
+            raise ValueError("missing_ts")
+        out["ts"] = _parse_ts(ts_val)
+        amt_val = canonical_raw.get("amount")
+        if amt_val is not None:
+            if isinstance(amt_val, int | float):
+                try:
+                    out["amount"] = float(amt_val)
+                except (TypeError, ValueError):
+                    out["amount"] = 0.0
+            else:
+                # Strip currency symbols, commas, spaces (e.g. "1,234.56" or "£ 1 234.56")
+                a = str(amt_val).strip().replace(",", "").replace(" ", "")
+                for sym in ("$", "£", "€", "USD", "GBP", "EUR"):
+                    if a.startswith(sym) or a.endswith(sym):
+                        a = a.replace(sym, "").strip()
+                if not a:
+                    out["amount"] = 0.0
+                else:
+                    try:
+                        out["amount"] = float(a)
+                    except (TypeError, ValueError) as e:
+                        raise ValueError(f"invalid amount: {amt_val!r}") from e
+        else:
+            out["amount"] = 0.0
+        if minor_units:
+            out["amount"] = out["amount"] / 100.0
+
+        # Optional with defaults
+        out["customer_name"] = (str(canonical_raw.get("customer_name") or "").strip()) or "Unknown"
+        country = (str(canonical_raw.get("country") or "").strip() or "XXX")[:3]
+        out["country"] = country
+        out["currency"] = (str(canonical_raw.get("currency") or "USD").strip())[:3]
+        out["merchant"] = (str(canonical_raw.get("merchant") or "").strip()) or None
+        out["counterparty"] = (str(canonical_raw.get("counterparty") or "").strip()) or None
+        out["country_txn"] = (str(canonical_raw.get("country_txn") or "").strip()) or None
+        out["channel"] = (str(canonical_raw.get("channel") or "").strip()) or None
+        out["direction"] = (str(canonical_raw.get("direction") or "").strip()) or None
+        out["base_risk"] = _risk_band_to_base_risk(canonical_raw.get("base_risk"))
+
+        # External id from dedicated column (e.g. transaction_id)
+        for ext_key in EXTERNAL_ID_SOURCE_ALIASES:
+            if ext_key in row and row[ext_key]:
+                v = row[ext_key]
+                if isinstance(v, str) and v.strip():
+                    external_id_override = v.strip()
+                    break
+                if v is not None and str(v).strip():
+                    external_id_override = str(v).strip()
+                    break
+
+        return out, external_id_override
+
+    return _normalize
+
+
 def normalize_row(
     row: dict[str, Any],
     column_map: dict[str, str],
@@ -284,79 +401,7 @@ def normalize_row(
     Returns (canonical_dict, external_id_override or None).
     Raises ValueError on parse errors for required fields.
     """
-    # Map external key -> value for canonical key
-    canonical_raw: dict[str, Any] = {}
-    external_id_override: str | None = None
-
-    for external_key, canonical_key in column_map.items():
-        if external_key not in row:
-            continue
-        val = row[external_key]
-        if val is None or (isinstance(val, str) and not val.strip()):
-            continue
-        canonical_raw[canonical_key] = val
-
-    # Apply type coercion and defaults
-    out: dict[str, Any] = {}
-
-    # Required
-    iban = canonical_raw.get("iban_or_acct") or ""
-    out["iban_or_acct"] = str(iban).strip() if iban else ""
-    ts_val = canonical_raw.get("ts")
-    if ts_val is None or (isinstance(ts_val, str) and not str(ts_val).strip()):
-        raise ValueError("missing_ts")
-    out["ts"] = _parse_ts(ts_val)
-    amt_val = canonical_raw.get("amount")
-    if amt_val is not None:
-        if isinstance(amt_val, int | float):
-            try:
-                out["amount"] = float(amt_val)
-            except (TypeError, ValueError):
-                out["amount"] = 0.0
-        else:
-            # Strip currency symbols, commas, spaces (e.g. "1,234.56" or "£ 1 234.56")
-            a = str(amt_val).strip().replace(",", "").replace(" ", "")
-            for sym in ("$", "£", "€", "USD", "GBP", "EUR"):
-                if a.startswith(sym) or a.endswith(sym):
-                    a = a.replace(sym, "").strip()
-            if not a:
-                out["amount"] = 0.0
-            else:
-                try:
-                    out["amount"] = float(a)
-                except (TypeError, ValueError) as e:
-                    raise ValueError(f"invalid amount: {amt_val!r}") from e
-    else:
-        out["amount"] = 0.0
-    # If amount came from a "minor units" column (e.g. cents), convert to major units
-    amount_src_keys = [k for k, v in column_map.items() if v == "amount"]
-    if any("minor" in k.lower() for k in amount_src_keys):
-        out["amount"] = out["amount"] / 100.0
-
-    # Optional with defaults
-    out["customer_name"] = (str(canonical_raw.get("customer_name") or "").strip()) or "Unknown"
-    country = (str(canonical_raw.get("country") or "").strip() or "XXX")[:3]
-    out["country"] = country
-    out["currency"] = (str(canonical_raw.get("currency") or "USD").strip())[:3]
-    out["merchant"] = (str(canonical_raw.get("merchant") or "").strip()) or None
-    out["counterparty"] = (str(canonical_raw.get("counterparty") or "").strip()) or None
-    out["country_txn"] = (str(canonical_raw.get("country_txn") or "").strip()) or None
-    out["channel"] = (str(canonical_raw.get("channel") or "").strip()) or None
-    out["direction"] = (str(canonical_raw.get("direction") or "").strip()) or None
-    out["base_risk"] = _risk_band_to_base_risk(canonical_raw.get("base_risk"))
-
-    # External id from dedicated column (e.g. transaction_id)
-    for ext_key in EXTERNAL_ID_SOURCE_ALIASES:
-        if ext_key in row and row[ext_key]:
-            v = row[ext_key]
-            if isinstance(v, str) and v.strip():
-                external_id_override = v.strip()
-                break
-            if v is not None and str(v).strip():
-                external_id_override = str(v).strip()
-                break
-
-    return out, external_id_override
+    return row_normalizer(column_map)(row)
 
 
 # ---------------------------------------------------------------------------
@@ -15,6 +15,7 @@ from sqlalchemy import (
     Text,
     UniqueConstraint,
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -168,6 +169,9 @@ class AuditLog(Base):
     entity_id: Mapped[str] = mapped_column(String(128), nullable=False)
     ts: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(UTC))
     actor: Mapped[str] = mapped_column(String(128), default="system", nullable=False)
-    details_json: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
+    # JSONB on Postgres: stored parsed (binary), indexable; plain JSON text elsewhere.
+    details_json: Mapped[dict[str, Any] | None] = mapped_column(
+        JSON().with_variant(JSONB(), "postgresql"), nullable=True
+    )
     prev_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
     row_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
@@ -103,12 +103,9 @@ def generate_sar_report(
             }
         )
 
+    report = {"generated_at": datetime.now(UTC).isoformat(), "alerts": records}
     with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(
-            {"generated_at": datetime.now(UTC).isoformat(), "alerts": records},
-            f,
-            indent=2,
-        )
+        json.dump(report, f, indent=2)
 
     fieldnames = [
         "alert_id",
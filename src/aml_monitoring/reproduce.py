@@ -189,11 +189,17 @@ def reproduce_run(
             .scalars()
             .all()
         )
-        txn_ids: set[int] = {a.transaction_id for a in alerts}
-        if txn_ids:
+        if alerts:
+            # Subquery instead of an IN list of ids: one bind, no round trip of ids through
+            # Python, and no SQLite variable limit on large runs.
+            alert_txn_ids = select(Alert.transaction_id).where(
+                Alert.correlation_id == correlation_id
+            )
             txns = list(
                 session.execute(
-                    select(Transaction).where(Transaction.id.in_(txn_ids)).order_by(Transaction.id)
+                    select(Transaction)
+                    .where(Transaction.id.in_(alert_txn_ids))
+                    .order_by(Transaction.id)
                 )
                 .scalars()
                 .all()
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 import hashlib
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
@@ -10,14 +11,19 @@ from typing import Any
 from aml_monitoring.schemas import RuleResult
 
 
+@functools.lru_cache(maxsize=256)
 def stable_rule_hash(rule_id: str, salt: str = "v1") -> str:
-    """Stable hash for rule (rule_id + salt) for audit evidence."""
+    """Stable hash for rule (rule_id + salt) for audit evidence (memoized: one sha256 per rule)."""
     return hashlib.sha256(f"{rule_id}:{salt}".encode()).hexdigest()[:16]
 
 
-@dataclass
+@dataclass(slots=True)
 class RuleContext:
-    """Context passed to rules: current transaction + session for DB lookups."""
+    """Context passed to rules: current transaction + session for DB lookups.
+
+    run_rules reuses one instance per chunk and overwrites its fields for each
+    transaction, so rules must read it synchronously and never keep a reference.
+    """
 
     transaction_id: int
     account_id: int
@@ -38,6 +44,7 @@ class BaseRule(ABC):
 
     rule_id: str = "base"
     RULE_HASH: str = ""  # Override in subclass for stable per-rule hash; else derived from rule_id.
+    COST: int = 100  # Relative evaluation cost; run_rules can order rules cheapest-first.
 
     def get_rule_hash(self) -> str:
         """Stable hash for this rule (stored in alert evidence_fields)."""
@@ -47,7 +54,19 @@ class BaseRule(ABC):
         """Called at start of each run_rules batch; override to clear per-run state."""
         pass
 
+    def prepare_batch_run(self) -> None:  # noqa: B027
+        """Called by run_rules (after reset_run_state) on rules that will see a whole run of
+        transactions; override to switch to per-run snapshots. Single-transaction callers
+        (/score, the stream consumer) never call it."""
+        pass
+
+    def never_fires(self) -> bool:
+        """True when this rule's config makes evaluate always return [] (e.g. an empty list);
+        run_rules then leaves it out of the per-transaction dispatch."""
+        return False
+
     @abstractmethod
     def evaluate(self, ctx: RuleContext) -> list[RuleResult]:
-        """Evaluate rule; return list of RuleResult (empty if no hit)."""
+        """Evaluate rule; return list of RuleResult (empty if no hit).
+        ctx is mutated between calls: copy any field you need to keep, never ctx itself."""
         ...
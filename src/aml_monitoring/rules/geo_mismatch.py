@@ -13,6 +13,7 @@ from aml_monitoring.schemas import RuleResult
 
 class GeoMismatchRule(BaseRule):
     rule_id = "GeoMismatch"
+    COST = 50  # one history query
 
     def __init__(self, config: dict) -> None:
         self.window_minutes = int(config.get("window_minutes", 60))
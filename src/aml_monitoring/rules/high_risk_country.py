@@ -5,22 +5,35 @@ from __future__ import annotations
 from aml_monitoring.rules.base import BaseRule, RuleContext
 from aml_monitoring.schemas import RuleResult
 
+_MAX_CACHED_COUNTRIES = 4096  # bound the per-rule cache against free-text country values
+
 
 class HighRiskCountryRule(BaseRule):
     rule_id = "HighRiskCountry"
+    COST = 2  # set probe
 
     def __init__(self, config: dict) -> None:
-        self.countries = {c.strip().upper() for c in config.get("countries", []) if c}
+        self.countries = frozenset(c.strip().upper() for c in config.get("countries", []) if c)
+        # Raw country value -> hit; country columns have few distinct values, so after warm-up
+        # evaluate is one dict probe with no strip/upper per transaction.
+        self._hit_by_country: dict[str, bool] = {}
         self.list_version = str(config.get("list_version", "unknown"))
         self.effective_date = str(config.get("effective_date", ""))
         self.severity = str(config.get("severity", "high"))
         self.score_delta = float(config.get("score_delta", 25.0))
 
+    def never_fires(self) -> bool:
+        return not self.countries
+
     def evaluate(self, ctx: RuleContext) -> list[RuleResult]:
         if not ctx.country:
             return []
-        country_upper = ctx.country.strip().upper()[:3]
-        if country_upper in self.countries:
+        hit = self._hit_by_country.get(ctx.country)
+        if hit is None:
+            hit = ctx.country.strip().upper()[:3] in self.countries
+            if len(self._hit_by_country) < _MAX_CACHED_COUNTRIES:
+                self._hit_by_country[ctx.country] = hit
+        if hit:
             evidence = {
                 "country": ctx.country,
                 "list_version": self.list_version,
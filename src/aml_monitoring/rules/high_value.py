@@ -8,6 +8,7 @@ from aml_monitoring.schemas import RuleResult
 
 class HighValueTransactionRule(BaseRule):
     rule_id = "HighValueTransaction"
+    COST = 1  # one float compare
 
     def __init__(self, config: dict) -> None:
         self.threshold = float(config.get("threshold_amount", 10_000))
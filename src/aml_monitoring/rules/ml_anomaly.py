@@ -28,6 +28,7 @@ class MLAnomalyRule(BaseRule):
     """
 
     rule_id = "MLAnomaly"
+    COST = 80  # feature queries + model call
 
     def __init__(self, config: dict[str, Any]) -> None:
         self.threshold = float(config.get("threshold", 0.7))
@@ -2,13 +2,14 @@
 
 from __future__ import annotations
 
-from aml_monitoring.network.metrics import ring_signal
+from aml_monitoring.network.metrics import RingIndex, ring_signal
 from aml_monitoring.rules.base import BaseRule, RuleContext
 from aml_monitoring.schemas import RuleResult
 
 
 class NetworkRingIndicatorRule(BaseRule):
     rule_id = "NetworkRingIndicator"
+    COST = 60  # two edge queries per account, or one per-run edge index build in run_rules
 
     def __init__(self, config: dict) -> None:
         self.min_shared_counterparties = int(config.get("min_shared_counterparties", 2))
@@ -17,14 +18,27 @@ class NetworkRingIndicatorRule(BaseRule):
         self.severity = str(config.get("severity", "high"))
         self.score_delta = float(config.get("score_delta", 40))
         self._seen_accounts: set[int] = set()
+        # Batch runs only: edge snapshot of the lookback window, built on first evaluate of a run.
+        # Elsewhere each evaluate runs the two targeted ring_signal queries instead.
+        self._use_index = False
+        self._index: RingIndex | None = None
 
     def reset_run_state(self) -> None:
         self._seen_accounts.clear()
+        self._index = None
+
+    def prepare_batch_run(self) -> None:
+        self._use_index = True
 
     def evaluate(self, ctx: RuleContext) -> list[RuleResult]:
         if ctx.account_id in self._seen_accounts:
             return []
-        signal = ring_signal(ctx.account_id, ctx.session, self.lookback_days)
+        if self._use_index:
+            if self._index is None:
+                self._index = RingIndex(ctx.session, self.lookback_days)
+            signal = self._index.signal(ctx.account_id)
+        else:
+            signal = ring_signal(ctx.account_id, ctx.session, self.lookback_days)
         if signal.overlap_count < self.min_shared_counterparties:
             return []
         if len(signal.linked_accounts) < self.min_linked_accounts:
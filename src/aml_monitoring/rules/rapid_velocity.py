@@ -13,6 +13,7 @@ from aml_monitoring.schemas import RuleResult
 
 class RapidVelocityRule(BaseRule):
     rule_id = "RapidVelocity"
+    COST = 50  # one COUNT query
 
     def __init__(self, config: dict) -> None:
         self.min_transactions = int(config.get("min_transactions", 5))
@@ -2,24 +2,40 @@
 
 from __future__ import annotations
 
+import re
+
 from aml_monitoring.rules.base import BaseRule, RuleContext
 from aml_monitoring.schemas import RuleResult
 
 
 class SanctionsKeywordRule(BaseRule):
     rule_id = "SanctionsKeywordMatch"
+    COST = 3  # one regex scan
 
     def __init__(self, config: dict) -> None:
         self.keywords = [k.lower() for k in config.get("keywords", [])]
+        # One case-insensitive pass over the raw counterparty rejects the (common) no-match
+        # case for all keywords without lowercasing it; only hits pay for .lower().
+        self._any_keyword = (
+            re.compile("|".join(map(re.escape, self.keywords)), re.IGNORECASE)
+            if self.keywords
+            else None
+        )
         self.list_version = str(config.get("list_version", "unknown"))
         self.effective_date = str(config.get("effective_date", ""))
         self.severity = str(config.get("severity", "high"))
         self.score_delta = float(config.get("score_delta", 30.0))
 
+    def never_fires(self) -> bool:
+        return self._any_keyword is None
+
     def evaluate(self, ctx: RuleContext) -> list[RuleResult]:
-        if not ctx.counterparty:
+        if not ctx.counterparty or self._any_keyword is None:
+            return []
+        if not self._any_keyword.search(ctx.counterparty):
             return []
         cp_lower = ctx.counterparty.lower()
+        # Hit: report the first keyword in config order, as before.
         for kw in self.keywords:
             if kw in cp_lower:
                 evidence = {
@@ -8,6 +8,7 @@ if dependencies (rapidfuzz, jellyfish) are not installed.
 from __future__ import annotations
 
 import logging
+import re
 from pathlib import Path
 from typing import Any
 
@@ -39,6 +40,7 @@ class SanctionsScreeningRule(BaseRule):
     """
 
     rule_id = "SanctionsScreening"
+    COST = 10  # in-memory fuzzy matching
 
     def __init__(self, config: dict) -> None:
         self.enabled = config.get("enabled", True)
@@ -57,6 +59,12 @@ class SanctionsScreeningRule(BaseRule):
 
         # Keyword fallback
         self.keywords = [k.lower() for k in config.get("keywords", [])]
+        # Same pre-screen as SanctionsKeywordRule: one case-insensitive scan per name.
+        self._any_keyword = (
+            re.compile("|".join(map(re.escape, self.keywords)), re.IGNORECASE)
+            if self.keywords
+            else None
+        )
         self.severity = str(config.get("severity", "high"))
         self.score_delta = float(config.get("score_delta", 30.0))
 
@@ -213,7 +221,11 @@ class SanctionsScreeningRule(BaseRule):
     def _keyword_fallback(self, names: list[tuple[str, str]]) -> list[RuleResult]:
         """Fall back to basic keyword matching when fuzzy module unavailable."""
         results: list[RuleResult] = []
+        if self._any_keyword is None:
+            return results
         for name, label in names:
+            if not self._any_keyword.search(name):
+                continue
             name_lower = name.lower()
             for kw in self.keywords:
                 if kw in name_lower:
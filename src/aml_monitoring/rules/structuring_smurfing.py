@@ -13,6 +13,7 @@ from aml_monitoring.schemas import RuleResult
 
 class StructuringSmurfingRule(BaseRule):
     rule_id = "StructuringSmurfing"
+    COST = 50  # one COUNT query
 
     def __init__(self, config: dict) -> None:
         self.threshold = float(config.get("threshold_amount", 9500))
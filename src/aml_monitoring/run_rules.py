@@ -4,23 +4,47 @@ from __future__ import annotations
 
 import logging
 import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
 
-from sqlalchemy import func, select
-from sqlalchemy.orm import joinedload
+import numpy as np
+from sqlalchemy import func, insert, select, text, update
 
 from aml_monitoring import ENGINE_VERSION, RULES_VERSION
 from aml_monitoring.audit_context import get_actor, get_correlation_id
 from aml_monitoring.config import get_config, get_config_hash
-from aml_monitoring.db import session_scope
-from aml_monitoring.models import Account, Alert, AuditLog, Transaction
+from aml_monitoring.db import get_engine, session_scope
+from aml_monitoring.models import Account, Alert, AuditLog, Customer, Transaction
 from aml_monitoring.rules import get_all_rules
-from aml_monitoring.rules.base import RuleContext
+from aml_monitoring.rules.base import BaseRule, RuleContext
 from aml_monitoring.schemas import RuleResult
-from aml_monitoring.scoring import compute_transaction_risk
+from aml_monitoring.scoring import compute_transaction_risks_bulk
 
 log = logging.getLogger(__name__)
 PROGRESS_INTERVAL = 5000  # log progress every N transactions
 
+# Plain column rows (no Transaction/Account/Customer objects or identity map) for rule input.
+# Outer joins: a transaction whose account or customer row is missing is still scored (with the
+# configured base risk), and chunk sizes count transactions, so the loop's end test stays exact.
+_CHUNK_COLUMNS = (
+    select(
+        Transaction.id,
+        Transaction.account_id,
+        Transaction.ts,
+        Transaction.amount,
+        Transaction.currency,
+        Transaction.merchant,
+        Transaction.counterparty,
+        Transaction.country,
+        Transaction.channel,
+        Transaction.direction,
+        Customer.id,
+        Customer.base_risk,
+    )
+    .outerjoin(Account, Account.id == Transaction.account_id)
+    .outerjoin(Customer, Customer.id == Account.customer_id)
+)
+
 
 def _get_last_processed_id(session, correlation_id: str) -> int | None:
     """Return last_processed_id from most recent run_rules audit for this correlation_id."""
@@ -37,6 +61,119 @@ def _get_last_processed_id(session, correlation_id: str) -> int | None:
     return int(val) if val is not None else None
 
 
+class AlertChunkedInsert:
+    """Buffer alert rows and write them with one executemany INSERT per `chunksize` rows.
+    Whatever is still buffered is written on a clean exit; the owning session commits.
+    `count` is the number of rows accepted so far (written or buffered)."""
+
+    def __init__(self, session, chunksize: int = 1000) -> None:
+        self.session = session
+        self.chunksize = max(1, int(chunksize))
+        self.queue: list[dict] = []
+        self.count = 0
+
+    def __enter__(self) -> AlertChunkedInsert:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.flush()
+
+    def insert(self, row: dict) -> None:
+        self.queue.append(row)
+        self.count += 1
+        if len(self.queue) >= self.chunksize:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.queue:
+            self.session.execute(insert(Alert), self.queue)
+            self.queue = []
+
+
+def _compile_rule_dispatch(
+    rules: list[BaseRule],
+    stop_at_score: float | None = None,
+) -> Callable[[RuleContext, float], list[tuple[RuleResult, str]]]:
+    """Build evaluate_all(ctx, base) -> [(hit, rule_hash), ...] over the enabled rules, once per
+    run. Bound evaluate methods and rule hashes are resolved here and rules whose config can
+    never produce a hit are dropped; zero- and one-rule plans skip the outer loop entirely.
+    With stop_at_score, remaining rules are skipped once the transaction's base risk plus its
+    hits' score deltas reach it: with no negative deltas the capped risk score can no longer
+    change. If any rule's score_delta is negative (or unknown) the stop is not applied."""
+    if stop_at_score is not None:
+        unsafe = [rule.rule_id for rule in rules if not getattr(rule, "score_delta", -1.0) >= 0]
+        if unsafe:
+            log.warning(
+                "short_circuit_at_max_score ignored: rules %s may have negative score_delta",
+                ", ".join(unsafe),
+            )
+            stop_at_score = None
+    plan = tuple((rule.evaluate, rule.get_rule_hash()) for rule in rules if not rule.never_fires())
+    if not plan:
+
+        def evaluate_all(ctx: RuleContext, base: float = 0.0) -> list[tuple[RuleResult, str]]:
+            return []
+
+    elif stop_at_score is not None:
+
+        def evaluate_all(ctx: RuleContext, base: float = 0.0) -> list[tuple[RuleResult, str]]:
+            out: list[tuple[RuleResult, str]] = []
+            total = base
+            for evaluate, rule_hash in plan:
+                for hit in evaluate(ctx):
+                    out.append((hit, rule_hash))
+                    total += hit.score_delta
+                if total >= stop_at_score:
+                    break
+            return out
+
+    elif len(plan) == 1:
+        ((evaluate, rule_hash),) = plan
+
+        def evaluate_all(ctx: RuleContext, base: float = 0.0) -> list[tuple[RuleResult, str]]:
+            return [(hit, rule_hash) for hit in evaluate(ctx)]
+
+    else:
+
+        def evaluate_all(ctx: RuleContext, base: float = 0.0) -> list[tuple[RuleResult, str]]:
+            return [(hit, rule_hash) for evaluate, rule_hash in plan for hit in evaluate(ctx)]
+
+    return evaluate_all
+
+
+@contextmanager
+def _alert_indexes_deferred(enabled: bool) -> Iterator[None]:
+    """Opt-in (run_rules.rebuild_indexes, SQLite only): drop the secondary indexes on alerts
+    for the run and recreate them from their saved DDL afterwards (then ANALYZE), so bulk alert
+    inserts skip per-row B-tree maintenance. Indexes are restored even if the run fails."""
+    if not enabled:
+        yield
+        return
+    engine = get_engine()
+    if engine.dialect.name != "sqlite":
+        log.warning("run_rules.rebuild_indexes is SQLite-only; keeping alert indexes")
+        yield
+        return
+    with engine.begin() as conn:
+        # sql IS NULL: automatic indexes backing UNIQUE/PK constraints, which cannot be dropped.
+        indexes = conn.execute(
+            text(
+                "SELECT name, sql FROM sqlite_master "
+                "WHERE type = 'index' AND tbl_name = 'alerts' AND sql IS NOT NULL"
+            )
+        ).all()
+        for name, _ in indexes:
+            conn.exec_driver_sql(f'DROP INDEX "{name}"')
+    try:
+        yield
+    finally:
+        with engine.begin() as conn:
+            for _, ddl in indexes:
+                conn.exec_driver_sql(ddl)
+            conn.exec_driver_sql("ANALYZE alerts")
+
+
 def run_rules(
     config_path: str | None = None,
     resume_from_correlation_id: str | None = None,
@@ -52,6 +189,7 @@ def run_rules(
     rules = get_all_rules(config)
     for rule in rules:
         rule.reset_run_state()
+        rule.prepare_batch_run()
     scoring_cfg = config.get("scoring", {})
     base_risk = float(scoring_cfg.get("base_risk_per_customer", 10))
     max_score = float(scoring_cfg.get("max_score", 100))
@@ -60,6 +198,13 @@ def run_rules(
     med_t = float(thresholds.get("medium", 66))
     run_rules_cfg = config.get("run_rules") or {}
     chunk_size = int(run_rules_cfg.get("chunk_size", 0))
+    alert_batch_size = int(run_rules_cfg.get("alert_batch_size", 1000))
+    if run_rules_cfg.get("short_circuit_at_max_score", False):
+        # Opt-in: cheapest rules first, and later rules skipped once max_score is reached.
+        rules = sorted(rules, key=lambda rule: rule.COST)
+        evaluate_all = _compile_rule_dispatch(rules, stop_at_score=max_score)
+    else:
+        evaluate_all = _compile_rule_dispatch(rules)
 
     run_correlation_id = resume_from_correlation_id or get_correlation_id()
     start = time.perf_counter()
@@ -70,119 +215,159 @@ def run_rules(
     total_transactions: int | None = None
     if chunk_size > 0:
         with session_scope() as session:
-            total_transactions = session.execute(select(func.count(Transaction.id))).scalar() or 0
+            total_transactions = (
+                session.execute(select(func.count()).select_from(Transaction)).scalar() or 0
+            )
 
     if resume_from_correlation_id:
         with session_scope() as session:
             last_processed_id = _get_last_processed_id(session, resume_from_correlation_id)
 
-    while True:
-        with session_scope() as session:
-            load_opts = joinedload(Transaction.account).joinedload(Account.customer)
-            if chunk_size > 0:
-                stmt = (
-                    select(Transaction)
-                    .options(load_opts)
-                    .where(Transaction.id > (last_processed_id or 0))
-                    .order_by(Transaction.id)
-                    .limit(chunk_size)
-                )
-                txns = list(session.execute(stmt).unique().scalars().all())
-            else:
-                stmt = select(Transaction).options(load_opts).order_by(Transaction.id)
-                txns = list(session.execute(stmt).unique().scalars().all())
-
-            if not txns:
-                break
-
-            if total_transactions is None:
-                total_transactions = len(txns)
-            total_in_run = len(txns) if chunk_size <= 0 else (total_transactions or len(txns))
-
-            processed_chunk = 0
-            alerts_chunk = 0
-            for txn in txns:
-                acct = txn.account
-                cust = acct.customer
+    rebuild_indexes = bool(run_rules_cfg.get("rebuild_indexes", False))
+    with _alert_indexes_deferred(rebuild_indexes):
+        while True:
+            # Alert rows are written in alert_batch_size INSERTs (rules never read alerts), and the
+            # remainder on exit, so a chunk's alerts commit together with its checkpoint.
+            with (
+                session_scope() as session,
+                AlertChunkedInsert(session, chunksize=alert_batch_size) as alert_writer,
+            ):
+                stmt = _CHUNK_COLUMNS.order_by(Transaction.id)
+                if chunk_size > 0:
+                    stmt = stmt.where(Transaction.id > (last_processed_id or 0)).limit(chunk_size)
+                txns = session.execute(stmt).all()
+
+                if not txns:
+                    break
+
+                if total_transactions is None:
+                    total_transactions = len(txns)
+                total_in_run = len(txns) if chunk_size <= 0 else (total_transactions or len(txns))
+
+                processed_chunk = 0
+                scored_ids: list[int] = []
+                bases: list[float] = []
+                delta_sums: list[float] = []
+                # One context per chunk, overwritten per transaction (rules never retain ctx).
                 ctx = RuleContext(
-                    transaction_id=txn.id,
-                    account_id=txn.account_id,
-                    customer_id=cust.id,
-                    ts=txn.ts,
-                    amount=txn.amount,
-                    currency=txn.currency or "USD",
-                    merchant=txn.merchant,
-                    counterparty=txn.counterparty,
-                    country=txn.country,
-                    channel=txn.channel,
-                    direction=txn.direction,
+                    transaction_id=0,
+                    account_id=0,
+                    customer_id=0,
+                    ts=None,
+                    amount=0.0,
+                    currency="USD",
+                    merchant=None,
+                    counterparty=None,
+                    country=None,
+                    channel=None,
+                    direction=None,
                     session=session,
                 )
-                all_hits: list[RuleResult] = []
-                for rule in rules:
-                    hits = rule.evaluate(ctx)
-                    for hit in hits:
+                for (
+                    txn_id,
+                    account_id,
+                    ts,
+                    amount,
+                    currency,
+                    merchant,
+                    counterparty,
+                    country,
+                    channel,
+                    direction,
+                    customer_id,
+                    customer_base_risk,
+                ) in txns:
+                    ctx.transaction_id = txn_id
+                    ctx.account_id = account_id
+                    ctx.customer_id = customer_id if customer_id is not None else 0
+                    ctx.ts = ts
+                    ctx.amount = amount
+                    ctx.currency = currency or "USD"
+                    ctx.merchant = merchant
+                    ctx.counterparty = counterparty
+                    ctx.country = country
+                    ctx.channel = channel
+                    ctx.direction = direction
+                    base = (
+                        float(customer_base_risk) if customer_base_risk is not None else base_risk
+                    )
+                    delta_sum = 0.0
+                    for hit, rule_hash in evaluate_all(ctx, base):
                         ev = dict(hit.evidence_fields or {})
-                        ev["rule_hash"] = rule.get_rule_hash()
-                        alert = Alert(
-                            transaction_id=txn.id,
-                            rule_id=hit.rule_id,
-                            severity=hit.severity,
-                            score=hit.score_delta,
-                            reason=hit.reason,
-                            evidence_fields=ev,
-                            config_hash=config_hash,
-                            rules_version=RULES_VERSION,
-                            engine_version=ENGINE_VERSION,
-                            correlation_id=run_correlation_id,
+                        ev["rule_hash"] = rule_hash
+                        alert_writer.insert(
+                            {
+                                "transaction_id": txn_id,
+                                "rule_id": hit.rule_id,
+                                "severity": hit.severity,
+                                "score": hit.score_delta,
+                                "reason": hit.reason,
+                                "evidence_fields": ev,
+                                "config_hash": config_hash,
+                                "rules_version": RULES_VERSION,
+                                "engine_version": ENGINE_VERSION,
+                                "correlation_id": run_correlation_id,
+                            }
+                        )
+                        delta_sum += hit.score_delta
+                    scored_ids.append(txn_id)
+                    bases.append(base)
+                    delta_sums.append(delta_sum)
+                    processed_chunk += 1
+                    last_processed_id = txn_id
+                    so_far = processed_total + processed_chunk
+                    if so_far % PROGRESS_INTERVAL == 0 or so_far == total_in_run:
+                        log.info(
+                            "run-rules progress: %s / %s transactions, %s alerts",
+                            so_far,
+                            total_in_run,
+                            alerts_total + alert_writer.count,
                         )
-                        session.add(alert)
-                        alerts_chunk += 1
-                        all_hits.append(hit)
-                base = float(cust.base_risk) if cust else base_risk
-                score, _ = compute_transaction_risk(
-                    base, all_hits, max_score=max_score, low_threshold=low_t, medium_threshold=med_t
+
+                # Score the whole chunk in one vectorized pass, then one ORM bulk UPDATE by primary
+                # key (executemany) for the chunk's scores.
+                scores, _ = compute_transaction_risks_bulk(
+                    np.array(bases), np.array(delta_sums), max_score, low_t, med_t
                 )
-                txn.risk_score = score
-                txn.config_hash = config_hash
-                txn.rules_version = RULES_VERSION
-                txn.engine_version = ENGINE_VERSION
-                processed_chunk += 1
-                last_processed_id = txn.id
-                so_far = processed_total + processed_chunk
-                if so_far % PROGRESS_INTERVAL == 0 or so_far == total_in_run:
-                    log.info(
-                        "run-rules progress: %s / %s transactions, %s alerts",
-                        so_far,
-                        total_in_run,
-                        alerts_total + alerts_chunk,
+                if scored_ids:
+                    session.execute(
+                        update(Transaction),
+                        [
+                            {
+                                "id": txn_id,
+                                "risk_score": score,
+                                "config_hash": config_hash,
+                                "rules_version": RULES_VERSION,
+                                "engine_version": ENGINE_VERSION,
+                            }
+                            for txn_id, score in zip(scored_ids, scores.tolist(), strict=True)
+                        ],
+                    )
+                processed_total += processed_chunk
+                alerts_total += alert_writer.count
+                duration_chunk = time.perf_counter() - start
+                details = {
+                    "processed": processed_total,
+                    "alerts_created": alerts_total,
+                    "duration_seconds": round(duration_chunk, 3),
+                    "config_hash": config_hash,
+                    "rules_version": RULES_VERSION,
+                    "engine_version": ENGINE_VERSION,
+                    "chunk_index": chunk_index,
+                    "last_processed_id": last_processed_id,
+                }
+                session.add(
+                    AuditLog(
+                        correlation_id=run_correlation_id,
+                        action="run_rules",
+                        entity_type="batch",
+                        entity_id="all",
+                        actor=get_actor(),
+                        details_json=details,
                     )
-
-            processed_total += processed_chunk
-            alerts_total += alerts_chunk
-            duration_chunk = time.perf_counter() - start
-            details = {
-                "processed": processed_total,
-                "alerts_created": alerts_total,
-                "duration_seconds": round(duration_chunk, 3),
-                "config_hash": config_hash,
-                "rules_version": RULES_VERSION,
-                "engine_version": ENGINE_VERSION,
-                "chunk_index": chunk_index,
-                "last_processed_id": last_processed_id,
-            }
-            session.add(
-                AuditLog(
-                    correlation_id=run_correlation_id,
-                    action="run_rules",
-                    entity_type="batch",
-                    entity_id="all",
-                    actor=get_actor(),
-                    details_json=details,
                 )
-            )
-            chunk_index += 1
-            if chunk_size <= 0 or len(txns) < chunk_size:
-                break
+                chunk_index += 1
+                if chunk_size <= 0 or len(txns) < chunk_size:
+                    break
 
     return processed_total, alerts_total
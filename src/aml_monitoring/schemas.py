@@ -5,7 +5,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any
 
-from pydantic import BaseModel, Field, field_validator, model_validator
+from pydantic import BaseModel, Field, TypeAdapter, field_validator, model_validator
 
 
 # --- Ingest / API input ---
@@ -84,6 +84,10 @@ class AlertResponse(BaseModel):
         return v if v in ALERT_STATUS_VALUES else "open"
 
 
+# Validates a whole page of ORM alerts in one pydantic-core call (from_attributes=True).
+ALERT_LIST_ADAPTER: TypeAdapter[list[AlertResponse]] = TypeAdapter(list[AlertResponse])
+
+
 class ScoreRequest(BaseModel):
     """Request body for /score endpoint."""
 
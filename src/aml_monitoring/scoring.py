@@ -5,6 +5,8 @@ from __future__ import annotations
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
+import numpy as np
+
 from aml_monitoring.schemas import RuleResult
 
 
@@ -84,6 +86,41 @@ def compute_transaction_risk(
     return score, band
 
 
+_BANDS = np.array(["low", "medium", "high"])
+
+
+def score_bands_bulk(
+    scores: np.ndarray,
+    low: float = 33,
+    medium: float = 66,
+    max_score: float = 100,
+) -> np.ndarray:
+    """Vectorized normalize_score + score_band: clamp to [0, max_score], then band each score.
+    The scalar functions stay pure Python; numpy only pays off on arrays."""
+    clamped = np.clip(np.asarray(scores, dtype=np.float64), 0.0, max_score)
+    return _BANDS[np.searchsorted(np.array([low, medium]), clamped, side="right")]
+
+
+def compute_transaction_risks_bulk(
+    bases: np.ndarray,
+    delta_sums: np.ndarray,
+    max_score: float = 100,
+    low_threshold: float = 33,
+    medium_threshold: float = 66,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized compute_transaction_risk for many transactions at once.
+    bases and delta_sums are aligned per transaction (delta_sums = summed rule score_delta).
+    Returns (risk_scores, bands) arrays in input order.
+    """
+    scores = np.clip(
+        np.asarray(bases, dtype=np.float64) + np.asarray(delta_sums, dtype=np.float64),
+        0.0,
+        max_score,
+    )
+    return scores, score_bands_bulk(scores, low_threshold, medium_threshold, max_score)
+
+
 # ---------------------------------------------------------------------------
 # Severity-weighted scoring
 # ---------------------------------------------------------------------------
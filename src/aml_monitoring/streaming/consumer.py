@@ -48,6 +48,9 @@ class StreamConsumer(ABC):
             self.deduplicator = None
 
         self.window = SlidingWindow(window_seconds=900)
+        # (config_hash, rules): rules parse their config (keyword regex, country frozenset,
+        # sanctions lists) in __init__, so they are built once per config, not per message.
+        self._rules: tuple[str, list[Any]] | None = None
 
     @abstractmethod
     def consume(self, max_messages: int | None = None) -> None:
@@ -73,11 +76,18 @@ class StreamConsumer(ABC):
         from aml_monitoring.schemas import RuleResult
         from aml_monitoring.scoring import compute_transaction_risk
 
-        from sqlalchemy import select
+        from sqlalchemy import insert, select
 
         config = get_config(self.config_path) if self.config_path else (self.config or {})
         config_hash = get_config_hash(config)
-        rules = get_all_rules(config)
+        if self._rules is None or self._rules[0] != config_hash:
+            self._rules = (config_hash, get_all_rules(config))
+        rules = self._rules[1]
+        # Each message is its own run, as with fresh instances. This only clears per-run dedup
+        # sets: prepare_batch_run is never called here, so no rule holds a per-run snapshot
+        # (network_ring queries one account via ring_signal) that a reset would force to rebuild.
+        for rule in rules:
+            rule.reset_run_state()
 
         scoring_cfg = config.get("scoring", {})
         base_risk = float(scoring_cfg.get("base_risk_per_customer", 10))
@@ -187,6 +197,7 @@ class StreamConsumer(ABC):
             )
 
             all_hits: list[RuleResult] = []
+            alert_rows: list[dict[str, Any]] = []
             for rule in rules:
                 hits = rule.evaluate(ctx)
                 for hit in hits:
@@ -199,33 +210,42 @@ class StreamConsumer(ABC):
 
                     ev = dict(hit.evidence_fields or {})
                     ev["rule_hash"] = rule.get_rule_hash()
-                    alert = Alert(
-                        transaction_id=txn.id,
-                        rule_id=hit.rule_id,
-                        severity=hit.severity,
-                        score=hit.score_delta,
-                        reason=hit.reason,
-                        evidence_fields=ev,
-                        config_hash=config_hash,
-                        rules_version=RULES_VERSION,
-                        engine_version=ENGINE_VERSION,
+                    alert_rows.append(
+                        {
+                            "transaction_id": txn.id,
+                            "rule_id": hit.rule_id,
+                            "severity": hit.severity,
+                            "score": hit.score_delta,
+                            "reason": hit.reason,
+                            "evidence_fields": ev,
+                            "config_hash": config_hash,
+                            "rules_version": RULES_VERSION,
+                            "engine_version": ENGINE_VERSION,
+                        }
                     )
-                    session.add(alert)
-                    session.flush()
+                    all_hits.append(hit)
 
+            if alert_rows:
+                # One Core INSERT ... RETURNING for the message's alerts (ids in row order).
+                inserted = session.execute(
+                    insert(Alert).returning(
+                        Alert.id, Alert.created_at, sort_by_parameter_order=True
+                    ),
+                    alert_rows,
+                ).all()
+                for row, (alert_id, created_at) in zip(alert_rows, inserted, strict=True):
                     alert_data = {
-                        "id": alert.id,
+                        "id": alert_id,
                         "transaction_id": txn.id,
-                        "rule_id": hit.rule_id,
-                        "severity": hit.severity,
-                        "score": hit.score_delta,
-                        "reason": hit.reason,
-                        "created_at": alert.created_at.isoformat() if alert.created_at else None,
+                        "rule_id": row["rule_id"],
+                        "severity": row["severity"],
+                        "score": row["score"],
+                        "reason": row["reason"],
+                        "created_at": created_at.isoformat() if created_at else None,
                     }
                     created_alerts.append(alert_data)
                     emit_alert_created(alert_data)
                     self.alert_count += 1
-                    all_hits.append(hit)
 
             base = float(cust.base_risk) if cust else base_risk
             score, _ = compute_transaction_risk(
@@ -6,21 +6,23 @@ from collections import defaultdict
 from logging import getLogger
 from pathlib import Path
 
-from sqlalchemy import select
+import numpy as np
+from sqlalchemy import func, select
 
-from aml_monitoring.config import get_config
+from aml_monitoring.config import YAML_DUMPER, get_config
 from aml_monitoring.db import session_scope
 from aml_monitoring.models import Transaction
 
 logger = getLogger(__name__)
 
 
-def _percentile(sorted_values: list[float], p: float) -> float:
-    """Return percentile (0..1) from sorted list. Returns 0 if empty."""
-    if not sorted_values:
+def _percentile(values: np.ndarray, p: float) -> float:
+    """Return nearest-rank percentile (0..1) of unsorted values. Returns 0 if empty.
+    np.partition selects the rank in O(n) instead of sorting the whole column."""
+    if not values.size:
         return 0.0
-    idx = min(int(p * len(sorted_values)), len(sorted_values) - 1)
-    return sorted_values[max(0, idx)]
+    idx = max(0, min(int(p * values.size), values.size - 1))
+    return float(np.partition(values, idx)[idx])
 
 
 def compute_tuned_config(config_path: str | None = None) -> dict:
@@ -33,12 +35,16 @@ def compute_tuned_config(config_path: str | None = None) -> dict:
     out: dict = {"rules": {}}
 
     with session_scope() as session:
-        amounts_row = session.execute(select(Transaction.amount)).fetchall()
+        amounts = np.fromiter(
+            session.execute(
+                select(func.abs(Transaction.amount)).where(Transaction.amount.is_not(None))
+            ).scalars(),
+            dtype=np.float64,
+        )
         vel_rows = session.execute(
             select(Transaction.account_id, Transaction.ts).order_by(Transaction.id)
         ).fetchall()
-    amounts = sorted([abs(r[0]) for r in amounts_row if r[0] is not None])
-    if not amounts:
+    if not amounts.size:
         logger.warning("No transactions in DB; returning base rule defaults.")
         out["rules"]["high_value"] = {"threshold_amount": 1000}
         return out
@@ -64,9 +70,9 @@ def compute_tuned_config(config_path: str | None = None) -> dict:
     account_max: dict[int, int] = defaultdict(int)
     for (acc_id, _), count in bucket_counts.items():
         account_max[acc_id] = max(account_max[acc_id], count)
-    max_counts = sorted(account_max.values())
-    if max_counts:
-        vel_p90 = _percentile([float(x) for x in max_counts], 0.90)
+    max_counts = np.fromiter(account_max.values(), dtype=np.float64, count=len(account_max))
+    if max_counts.size:
+        vel_p90 = _percentile(max_counts, 0.90)
         min_txns = max(3, int(vel_p90) + 1)
         out["rules"]["rapid_velocity"] = {
             "min_transactions": min_txns,
@@ -87,7 +93,14 @@ def write_tuned_config(
     path.parent.mkdir(parents=True, exist_ok=True)
     with open(path, "w", encoding="utf-8") as f:
         f.write("# Auto-generated by 'aml train'. Merged over default + dev. Edit to override.\n")
-        yaml.dump(tuned, f, default_flow_style=False, sort_keys=True, allow_unicode=True)
+        yaml.dump(
+            tuned,
+            f,
+            Dumper=YAML_DUMPER,
+            default_flow_style=False,
+            sort_keys=True,
+            allow_unicode=True,
+        )
     logger.info("Wrote tuned config to %s", path)
 
 
@@ -0,0 +1,123 @@
+"""Shared seeding helpers for tests (plain functions, not pytest fixtures)."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy import insert
+
+from aml_monitoring.models import Account, Alert, Customer, Transaction
+
+
+def _customer_account_tx(
+    *,
+    iban: str,
+    amount: float,
+    currency: str,
+    country: str,
+    name: str,
+    counterparty: str | None,
+    ts: datetime | None,
+) -> tuple[Customer, Account, Transaction]:
+    """Build (unflushed) Customer -> Account -> Transaction linked via relationships."""
+    c = Customer(name=name, country=country, base_risk=10.0)
+    a = Account(customer=c, iban_or_acct=iban)
+    t = Transaction(
+        account=a,
+        ts=ts or datetime.now(UTC),
+        amount=amount,
+        currency=currency,
+        counterparty=counterparty,
+    )
+    return c, a, t
+
+
+def seed_customer_account_tx(
+    session,
+    *,
+    iban: str,
+    amount: float = 100.0,
+    currency: str = "USD",
+    country: str = "USA",
+    name: str = "Test Customer",
+    counterparty: str | None = None,
+    ts: datetime | None = None,
+) -> Transaction:
+    """Add Customer -> Account -> Transaction linked via relationships; one flush assigns all ids."""
+    c, a, t = _customer_account_tx(
+        iban=iban,
+        amount=amount,
+        currency=currency,
+        country=country,
+        name=name,
+        counterparty=counterparty,
+        ts=ts,
+    )
+    session.add_all([c, a, t])
+    session.flush()
+    return t
+
+
+def insert_alerts(session, rows: list[dict[str, Any]]) -> list[int]:
+    """Bulk-insert alert rows with one Core executemany (no identity map / unit of work).
+    Column defaults (status, created_at) still apply. Returns ids in row order."""
+    if not rows:
+        return []
+    result = session.execute(insert(Alert).returning(Alert.id, sort_by_parameter_order=True), rows)
+    return list(result.scalars())
+
+
+def seed_case_scenario(
+    session,
+    *,
+    iban: str = "IBAN_CASE",
+    n_alerts: int = 2,
+    name: str = "Case Customer",
+    amount: float = 100.0,
+    orm_identity_needed: bool = False,
+) -> tuple[int, ...]:
+    """Seed one customer/account/transaction with n_alerts open alerts.
+    Returns the alert ids in creation order (rule_ids R1..Rn). Alerts go through a Core
+    bulk insert unless orm_identity_needed, which adds them as ORM instances so they sit
+    in the session's identity map."""
+    c, a, t = _customer_account_tx(
+        iban=iban,
+        amount=amount,
+        currency="USD",
+        country="USA",
+        name=name,
+        counterparty=None,
+        ts=None,
+    )
+    if not orm_identity_needed:
+        session.add_all([c, a, t])
+        session.flush()
+        return tuple(
+            insert_alerts(
+                session,
+                [
+                    {
+                        "transaction_id": t.id,
+                        "rule_id": f"R{i}",
+                        "severity": "high",
+                        "score": 10.0,
+                        "reason": f"R{i}",
+                    }
+                    for i in range(1, n_alerts + 1)
+                ],
+            )
+        )
+    alerts = [
+        Alert(
+            transaction=t,
+            rule_id=f"R{i}",
+            severity="high",
+            score=10.0,
+            reason=f"R{i}",
+        )
+        for i in range(1, n_alerts + 1)
+    ]
+    session.add_all([c, a, t, *alerts])
+    session.flush()
+    return tuple(alert.id for alert in alerts)
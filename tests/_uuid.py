@@ -0,0 +1,6 @@
+"""Shared UUID format check for tests."""
+
+import re
+
+# Canonical lowercase str(uuid.uuid4()) form; use with fullmatch.
+_UUID_RE = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
@@ -3,18 +3,69 @@
 from __future__ import annotations
 
 import os
+import sqlite3
+import uuid
+from contextlib import closing
 from pathlib import Path
 
 import pytest
+import yaml
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
 
 # Ensure all tests use SQLite by default; ignore DATABASE_URL unless running
 # the optional Postgres smoke test (which uses POSTGRES_TEST_URL only).
 if "POSTGRES_TEST_URL" not in os.environ:
     os.environ.pop("DATABASE_URL", None)
+# Test DBs are disposable: let init_db skip SQLite fsync/journal durability (see db.py).
+os.environ.setdefault("AML_TEST_FAST_PRAGMAS", "1")
 
+from aml_monitoring import db as db_module
 from aml_monitoring.config import get_config
-from aml_monitoring.db import init_db, session_scope
+from aml_monitoring.db import bind_engine, get_engine, init_db, session_scope
 from aml_monitoring.models import Account, Customer
+from aml_monitoring.security import reset_rate_limits
+
+# Config parsing uses yaml.CSafeLoader when available; fail loudly if libyaml isn't linked.
+assert (
+    yaml.__with_libyaml__
+), "PyYAML was built without libyaml (install libyaml and reinstall PyYAML)"
+
+# pytest-xdist runs each worker as its own process (engine globals are already per-process);
+# tag named in-memory DBs with the worker id so they stay distinguishable in logs.
+_WORKER_ID = os.environ.get("PYTEST_XDIST_WORKER", "main")
+
+
+@pytest.fixture(scope="session")
+def _template_db(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """SQLite file with the full schema, created once; tests copy it instead of re-running DDL."""
+    template = tmp_path_factory.mktemp("template_db") / "template.db"
+    init_db(f"sqlite:///{template}", echo=False)
+    get_engine().dispose()
+    return template
+
+
+@pytest.fixture
+def fresh_db(_template_db: Path):
+    """Factory: load the template schema into a named in-memory SQLite DB, bind the engine to it,
+    return its URL. An anchor connection keeps each DB alive across init_db rebinds until teardown.
+    """
+    anchors: list[sqlite3.Connection] = []
+
+    def _make(name: str = "test.db") -> str:
+        uri = f"file:{Path(name).stem}_{_WORKER_ID}_{uuid.uuid4().hex}?mode=memory&cache=shared"
+        anchor = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        anchors.append(anchor)
+        with closing(sqlite3.connect(_template_db)) as template:
+            template.backup(anchor)
+        url = f"sqlite:///{uri}&uri=true"
+        bind_engine(url, echo=False)
+        return url
+
+    yield _make
+    get_engine().dispose()
+    for anchor in anchors:
+        anchor.close()
 
 
 @pytest.fixture
@@ -72,3 +123,90 @@ def sample_customer_and_account(db_session):
     db_session.add(a)
     db_session.flush()
     return c.id, a.id
+
+
+@pytest.fixture(scope="session")
+def api_db(tmp_path_factory: pytest.TempPathFactory):
+    """Create the API test DB once per session; return (engine, config_path)."""
+    db_name = f"aml_api_test_{_WORKER_ID}_{uuid.uuid4().hex}"
+    config_file = tmp_path_factory.mktemp("api") / "api_config.yaml"
+    config_file.write_text(
+        f"""
+app:
+  log_level: INFO
+database:
+  url: "sqlite:///file:{db_name}?mode=memory&cache=shared&uri=true"
+  echo: false
+rules:
+  high_value:
+    enabled: true
+    threshold_amount: 10000
+  sanctions_keyword:
+    enabled: true
+    keywords: [sanctioned, ofac]
+  high_risk_country:
+    enabled: true
+    countries: [IR]
+scoring:
+  base_risk_per_customer: 10
+  max_score: 100
+  thresholds: {{ low: 33, medium: 66, high: 100 }}
+"""
+    )
+    config_path = str(config_file)
+    cfg = get_config(config_path)
+    init_db(cfg["database"]["url"], echo=False)
+    engine = get_engine()
+    # pysqlite defers BEGIN until the first DML, which lets RELEASE SAVEPOINT commit for real.
+    # Emit BEGIN ourselves so per-test SAVEPOINTs nest inside the outer rollback-only transaction.
+    with engine.connect() as conn:
+        conn.connection.dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _emit_begin(conn):
+        if not conn.connection.dbapi_connection.in_transaction:
+            conn.exec_driver_sql("BEGIN")
+
+    return engine, config_path
+
+
+@pytest.fixture(scope="session")
+def api_test_client():
+    """One TestClient for the whole session; tests reset the DB, not the app."""
+    from fastapi.testclient import TestClient
+
+    from aml_monitoring.api import app
+
+    return TestClient(app)
+
+
+@pytest.fixture
+def api_client(api_db, api_test_client, monkeypatch: pytest.MonkeyPatch):
+    """Client on the session DB; each test runs in an outer transaction rolled back on teardown.
+    session_scope() commits only release a SAVEPOINT, so app and test code share uncommitted data.
+    """
+    engine, config_path = api_db
+    reset_rate_limits()
+    monkeypatch.setenv("AML_API_KEYS", "admin:test_admin_key")
+    monkeypatch.setenv("AML_CONFIG_PATH", config_path)
+    conn = engine.connect()
+    trans = conn.begin()
+    monkeypatch.setattr(db_module, "_engine", engine)
+    monkeypatch.setattr(
+        db_module,
+        "_SessionLocal",
+        sessionmaker(bind=conn, autoflush=False, join_transaction_mode="create_savepoint"),
+    )
+    try:
+        yield api_test_client
+    finally:
+        trans.rollback()
+        conn.close()
+
+
+@pytest.fixture
+def db_tx(api_client):
+    """Session inside api_client's outer transaction, for direct ORM/Core seeding.
+    Flushed rows are visible to the app; everything is rolled back with the test."""
+    with session_scope() as session:
+        yield session
@@ -2,65 +2,24 @@
 
 import os
 from datetime import UTC, datetime
-from pathlib import Path
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import select
+from sqlalchemy import exists, or_, select
 
+from aml_monitoring import auth as auth_module
 from aml_monitoring.api import app
 from aml_monitoring.audit_context import set_audit_context
-from aml_monitoring.config import get_config
-from aml_monitoring.db import init_db, session_scope
-from aml_monitoring.models import Account, Alert, AuditLog, Customer, Transaction
-from aml_monitoring.run_rules import run_rules
-from aml_monitoring.security import reset_rate_limits
+from aml_monitoring.auth import require_api_key_write, require_write_scope
+from aml_monitoring.db import session_scope
+from aml_monitoring.models import AuditLog
+from tests._fixtures import insert_alerts, seed_case_scenario, seed_customer_account_tx
+from tests._uuid import _UUID_RE
 
 # For mutation tests: fixture sets AML_API_KEYS=admin:test_admin_key; use this header.
 AUTH_HEADERS = {"X-API-Key": "test_admin_key"}
 
 
-@pytest.fixture
-def api_client(tmp_path: Path):
-    """Client with DB initialized; use file DB so app lifespan shares same DB as fixture."""
-    reset_rate_limits()
-    os.environ["AML_API_KEYS"] = "admin:test_admin_key"
-    db_file = tmp_path / "api_test.db"
-    config_file = tmp_path / "api_config.yaml"
-    config_file.write_text(
-        f"""
-app:
-  log_level: INFO
-database:
-  url: "sqlite:///{db_file}"
-  echo: false
-rules:
-  high_value:
-    enabled: true
-    threshold_amount: 10000
-  sanctions_keyword:
-    enabled: true
-    keywords: [sanctioned, ofac]
-  high_risk_country:
-    enabled: true
-    countries: [IR]
-scoring:
-  base_risk_per_customer: 10
-  max_score: 100
-  thresholds: {{ low: 33, medium: 66, high: 100 }}
-"""
-    )
-    config_path = str(config_file)
-    os.environ["AML_CONFIG_PATH"] = config_path
-    try:
-        cfg = get_config(config_path)
-        init_db(cfg["database"]["url"], echo=False)
-        yield TestClient(app)
-    finally:
-        os.environ.pop("AML_CONFIG_PATH", None)
-        os.environ.pop("AML_API_KEYS", None)
-
-
 def test_score_transaction_stateless(api_client: TestClient) -> None:
     """Score a transaction without account in DB - stateless rules only."""
     resp = api_client.post(
@@ -85,6 +44,38 @@ def test_score_transaction_stateless(api_client: TestClient) -> None:
     assert any(h["rule_id"] == "HighValueTransaction" for h in data["rule_hits"])
 
 
+def test_score_network_ring_queries_one_account(
+    api_client: TestClient, db_tx, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """/score runs the targeted ring_signal queries; it never loads the whole edge window."""
+    import aml_monitoring.rules.network_ring as network_ring
+
+    def _no_index(*args, **kwargs):
+        raise AssertionError("/score must not build a RingIndex")
+
+    calls: list[int] = []
+    real_ring_signal = network_ring.ring_signal
+
+    def counting_ring_signal(account_id, session, lookback_days):
+        calls.append(account_id)
+        return real_ring_signal(account_id, session, lookback_days)
+
+    monkeypatch.setattr(network_ring, "RingIndex", _no_index)
+    monkeypatch.setattr(network_ring, "ring_signal", counting_ring_signal)
+    t = seed_customer_account_tx(db_tx, iban="IBAN_SCORE_RING")
+    body = {
+        "transaction": {
+            "account_id": t.account_id,
+            "ts": datetime.now(UTC).isoformat(),
+            "amount": 100,
+            "currency": "USD",
+        }
+    }
+    for _ in range(2):
+        assert api_client.post("/score", json=body).status_code == 200
+    assert calls == [t.account_id, t.account_id]
+
+
 def test_list_alerts_empty(api_client: TestClient) -> None:
     resp = api_client.get("/alerts", params={"limit": 10})
     assert resp.status_code == 200
@@ -93,30 +84,15 @@ def test_list_alerts_empty(api_client: TestClient) -> None:
     assert data["next_cursor"] is None
 
 
-def test_network_account_returns_edges(api_client: TestClient) -> None:
+def test_network_account_returns_edges(api_client: TestClient, db_tx) -> None:
     """GET /network/account/{id} returns edges and ring_signal for seeded account."""
     from aml_monitoring.network import build_network
 
     config_path = os.environ.get("AML_CONFIG_PATH")
     if not config_path:
         pytest.skip("AML_CONFIG_PATH not set")
-    with session_scope() as session:
-        c = Customer(name="NetC", country="USA", base_risk=10.0)
-        session.add(c)
-        session.flush()
-        a = Account(customer_id=c.id, iban_or_acct="IBAN_NET")
-        session.add(a)
-        session.flush()
-        t = Transaction(
-            account_id=a.id,
-            ts=datetime.now(UTC),
-            amount=100.0,
-            currency="USD",
-            counterparty="counterparty_a",
-        )
-        session.add(t)
-        session.flush()
-        account_id = a.id
+    t = seed_customer_account_tx(db_tx, iban="IBAN_NET", name="NetC", counterparty="counterparty_a")
+    account_id = t.account_id
     set_audit_context("net-build", "test")
     build_network(config_path=config_path)
     resp = api_client.get(f"/network/account/{account_id}")
@@ -154,32 +130,29 @@ def test_openapi_includes_cases_paths(api_client: TestClient) -> None:
     assert "/cases/{case_id}" in paths
 
 
-def test_alerts_filter_by_correlation_id(api_client: TestClient) -> None:
+def test_alerts_filter_by_correlation_id(api_client: TestClient, db_tx) -> None:
     """GET /alerts?correlation_id=X returns only alerts from runs with that correlation_id."""
-    config_path = os.environ["AML_CONFIG_PATH"]
-    with session_scope() as session:
-        c = Customer(name="CorrCustomer", country="USA", base_risk=10.0)
-        session.add(c)
-        session.flush()
-        a = Account(customer_id=c.id, iban_or_acct="IBAN_CORR")
-        session.add(a)
-        session.flush()
-        t = Transaction(
-            account_id=a.id,
-            ts=datetime.now(UTC),
-            amount=15000.0,
-            currency="USD",
-        )
-        session.add(t)
-    set_audit_context("cid-run-1", "test")
-    run_rules(config_path)
-    set_audit_context("cid-run-2", "test")
-    run_rules(config_path)
+    t = seed_customer_account_tx(db_tx, iban="IBAN_CORR", name="CorrCustomer", amount=15000.0)
+    insert_alerts(
+        db_tx,
+        [
+            {
+                "transaction_id": t.id,
+                "rule_id": "HighValueTransaction",
+                "severity": "high",
+                "score": 25.0,
+                "reason": "seeded",
+                "correlation_id": cid,
+            }
+            for cid in ("cid-run-1", "cid-run-2")
+        ],
+    )
     r1 = api_client.get("/alerts", params={"correlation_id": "cid-run-1"})
     r2 = api_client.get("/alerts", params={"correlation_id": "cid-run-2"})
     assert r1.status_code == 200 and r2.status_code == 200
     alerts1 = r1.json()["items"]
     alerts2 = r2.json()["items"]
+    assert len(alerts1) == 1 and len(alerts2) == 1
     ids1 = {a["id"] for a in alerts1}
     ids2 = {a["id"] for a in alerts2}
     assert ids1 & ids2 == set(), "alerts must not overlap between correlation_id runs"
@@ -194,29 +167,15 @@ def test_get_transaction_404(api_client: TestClient) -> None:
     assert resp.status_code == 404
 
 
-def test_response_includes_x_correlation_id(api_client: TestClient) -> None:
-    """API response must include X-Correlation-ID header (generated or echoed from request)."""
-    resp = api_client.post(
-        "/score",
-        json={
-            "transaction": {
-                "account_id": 1,
-                "ts": datetime.now(UTC).isoformat().replace("+00:00", "Z"),
-                "amount": 100,
-                "currency": "USD",
-                "country": "USA",
-            }
-        },
-    )
-    assert resp.status_code == 200
-    assert "X-Correlation-ID" in resp.headers
-    assert len(resp.headers["X-Correlation-ID"]) == 36
-    assert resp.headers["X-Correlation-ID"].count("-") == 4
-
-
-def test_x_correlation_id_echoed_when_provided(api_client: TestClient) -> None:
-    """When client sends X-Correlation-ID, response echoes the same value."""
-    client_cid = "client-request-id-12345"
+@pytest.mark.parametrize(
+    "headers,expect_echo",
+    [({}, False), ({"X-Correlation-ID": "client-request-id-12345"}, True)],
+    ids=["generated", "echoed"],
+)
+def test_score_x_correlation_id(
+    api_client: TestClient, headers: dict[str, str], expect_echo: bool
+) -> None:
+    """/score responses carry X-Correlation-ID: a generated UUID, or the client's value echoed."""
     resp = api_client.post(
         "/score",
         json={
@@ -228,39 +187,23 @@ def test_x_correlation_id_echoed_when_provided(api_client: TestClient) -> None:
                 "country": "USA",
             }
         },
-        headers={"X-Correlation-ID": client_cid},
+        headers=headers,
     )
     assert resp.status_code == 200
-    assert resp.headers.get("X-Correlation-ID") == client_cid
+    data = resp.json()
+    assert "risk_score" in data
+    assert data["band"] in ("low", "medium", "high")
+    cid = resp.headers.get("X-Correlation-ID")
+    assert cid is not None
+    if expect_echo:
+        assert cid == headers["X-Correlation-ID"]
+    else:
+        assert _UUID_RE.fullmatch(cid)
 
 
-def test_patch_alert_updates_status_and_disposition(api_client: TestClient) -> None:
+def test_patch_alert_updates_status_and_disposition(api_client: TestClient, db_tx) -> None:
     """PATCH /alerts/{id} updates status and disposition; response has X-Correlation-ID; GET reflects update."""
-    with session_scope() as session:
-        c = Customer(name="C", country="USA", base_risk=10.0)
-        session.add(c)
-        session.flush()
-        a = Account(customer_id=c.id, iban_or_acct="IBANX")
-        session.add(a)
-        session.flush()
-        t = Transaction(
-            account_id=a.id,
-            ts=datetime.now(UTC),
-            amount=100.0,
-            currency="USD",
-        )
-        session.add(t)
-        session.flush()
-        alert = Alert(
-            transaction_id=t.id,
-            rule_id="TestRule",
-            severity="high",
-            score=20.0,
-            reason="Test",
-        )
-        session.add(alert)
-        session.flush()
-        alert_id = alert.id
+    (alert_id,) = seed_case_scenario(db_tx, iban="IBANX", name="C", n_alerts=1)
     resp = api_client.patch(
         f"/alerts/{alert_id}",
         json={"status": "closed", "disposition": "false_positive"},
@@ -280,33 +223,9 @@ def test_patch_alert_updates_status_and_disposition(api_client: TestClient) -> N
     assert found["disposition"] == "false_positive"
 
 
-def test_patch_alert_audit_log(api_client: TestClient) -> None:
+def test_patch_alert_audit_log(api_client: TestClient, db_tx) -> None:
     """After PATCH, AuditLog has disposition_update with correlation_id, actor, details_json."""
-    with session_scope() as session:
-        c = Customer(name="C2", country="USA", base_risk=10.0)
-        session.add(c)
-        session.flush()
-        a = Account(customer_id=c.id, iban_or_acct="IBANY")
-        session.add(a)
-        session.flush()
-        t = Transaction(
-            account_id=a.id,
-            ts=datetime.now(UTC),
-            amount=200.0,
-            currency="USD",
-        )
-        session.add(t)
-        session.flush()
-        alert = Alert(
-            transaction_id=t.id,
-            rule_id="R2",
-            severity="medium",
-            score=10.0,
-            reason="R2",
-        )
-        session.add(alert)
-        session.flush()
-        alert_id = alert.id
+    (alert_id,) = seed_case_scenario(db_tx, iban="IBANY", name="C2", n_alerts=1, amount=200.0)
     api_client.patch(
         f"/alerts/{alert_id}",
         json={"status": "closed", "disposition": "escalate"},
@@ -336,83 +255,9 @@ def test_patch_alert_audit_log(api_client: TestClient) -> None:
     assert "config_hash" in details
 
 
-def test_patch_alert_404(api_client: TestClient) -> None:
-    """PATCH /alerts/{id} returns 404 when alert not found."""
-    resp = api_client.patch(
-        "/alerts/99999",
-        json={"status": "closed"},
-        headers=AUTH_HEADERS,
-    )
-    assert resp.status_code == 404
-
-
-def test_patch_alert_invalid_status_400(api_client: TestClient) -> None:
-    """PATCH /alerts/{id} returns 400 for invalid status."""
-    with session_scope() as session:
-        c = Customer(name="C3", country="USA", base_risk=10.0)
-        session.add(c)
-        session.flush()
-        a = Account(customer_id=c.id, iban_or_acct="IBANZ")
-        session.add(a)
-        session.flush()
-        t = Transaction(
-            account_id=a.id,
-            ts=datetime.now(UTC),
-            amount=50.0,
-            currency="USD",
-        )
-        session.add(t)
-        session.flush()
-        alert = Alert(
-            transaction_id=t.id,
-            rule_id="R3",
-            severity="low",
-            score=5.0,
-            reason="R3",
-        )
-        session.add(alert)
-        session.flush()
-        aid = alert.id
-    resp = api_client.patch(f"/alerts/{aid}", json={"status": "invalid"}, headers=AUTH_HEADERS)
-    assert resp.status_code == 400
-
-
-def test_case_workflow_e2e(api_client: TestClient) -> None:
+def test_case_workflow_e2e(api_client: TestClient, db_tx) -> None:
     """Create alerts, create case from alert_ids, update status, add note; verify AuditLog and GET."""
-    with session_scope() as session:
-        c = Customer(name="CaseCust", country="USA", base_risk=10.0)
-        session.add(c)
-        session.flush()
-        a = Account(customer_id=c.id, iban_or_acct="IBAN_CASE")
-        session.add(a)
-        session.flush()
-        t = Transaction(
-            account_id=a.id,
-            ts=datetime.now(UTC),
-            amount=100.0,
-            currency="USD",
-        )
-        session.add(t)
-        session.flush()
-        alert1 = Alert(
-            transaction_id=t.id,
-            rule_id="R1",
-            severity="high",
-            score=15.0,
-            reason="R1",
-        )
-        session.add(alert1)
-        session.flush()
-        alert2 = Alert(
-            transaction_id=t.id,
-            rule_id="R2",
-            severity="medium",
-            score=10.0,
-            reason="R2",
-        )
-        session.add(alert2)
-        session.flush()
-        a1_id, a2_id = alert1.id, alert2.id
+    a1_id, a2_id = seed_case_scenario(db_tx, iban="IBAN_CASE", name="CaseCust")
 
     create_resp = api_client.post(
         "/cases",
@@ -460,24 +305,19 @@ def test_case_workflow_e2e(api_client: TestClient) -> None:
     assert len(got["items"]) == 2
     assert len(got["notes"]) == 2
 
+    case_rows = (AuditLog.entity_type == "case", AuditLog.entity_id == str(case_id))
     with session_scope() as session:
-        rows = list(
-            session.execute(
-                select(AuditLog.action, AuditLog.correlation_id, AuditLog.actor)
-                .where(
-                    AuditLog.entity_type == "case",
-                    AuditLog.entity_id == str(case_id),
+        actions = set(session.execute(select(AuditLog.action).where(*case_rows)).scalars())
+        untraced = session.execute(
+            select(
+                exists().where(
+                    *case_rows,
+                    or_(AuditLog.correlation_id.is_(None), AuditLog.actor.is_(None)),
                 )
-                .order_by(AuditLog.id)
-            ).all()
-        )
-    actions = [r[0] for r in rows]
-    assert "case_create" in actions
-    assert "case_update" in actions
-    assert "case_note_add" in actions
-    for r in rows:
-        assert r[1] is not None  # correlation_id
-        assert r[2] is not None  # actor
+            )
+        ).scalar()
+    assert {"case_create", "case_update", "case_note_add"} <= actions
+    assert not untraced, "every case audit row must carry correlation_id and actor"
 
 
 def test_case_invalid_status_transition_400(api_client: TestClient) -> None:
@@ -494,106 +334,60 @@ def test_case_invalid_status_transition_400(api_client: TestClient) -> None:
     assert "Invalid transition" in resp2.json().get("detail", "")
 
 
-def test_read_only_key_gets_403_on_patch_alerts(api_client: TestClient) -> None:
-    """Key with scope read_only cannot PATCH /alerts (403)."""
-    os.environ["AML_API_KEYS"] = "admin:test_admin_key,reader:read_only_key:read_only"
+@pytest.fixture
+def seeded_alert_id(db_tx) -> int:
+    """One open alert shared by the PATCH /alerts status-code matrix."""
+    (alert_id,) = seed_case_scenario(db_tx, iban="IBAN_PATCH", name="PatchC", n_alerts=1)
+    return alert_id
+
+
+def _read_only_actor() -> str:
+    """Stand-in for require_api_key_write: a valid key whose scope is read_only."""
+    auth_module._current_scope.set("read_only")
+    require_write_scope()
+    return "reader"
+
+
+@pytest.mark.parametrize(
+    "headers,body,use_missing_id,as_reader,expected_status",
+    [
+        ({}, {"status": "closed"}, False, False, 401),
+        ({"X-API-Key": "invalid_key"}, {"status": "closed"}, False, False, 401),
+        ({}, {"status": "closed"}, False, True, 403),
+        (AUTH_HEADERS, {"status": "invalid"}, False, False, 400),
+        (AUTH_HEADERS, {"status": "closed"}, True, False, 404),
+        (AUTH_HEADERS, {"status": "closed"}, False, False, 200),
+    ],
+    ids=["no_key", "invalid_key", "read_only_scope", "invalid_status", "not_found", "write_key"],
+)
+def test_patch_alert_status_codes(
+    api_client: TestClient,
+    seeded_alert_id: int,
+    headers: dict[str, str],
+    body: dict[str, str],
+    use_missing_id: bool,
+    as_reader: bool,
+    expected_status: int,
+) -> None:
+    """PATCH /alerts/{id}: auth (401), scope (403), validation (400), missing (404), success (200).
+    The read_only case overrides the auth dependency instead of re-keying AML_API_KEYS."""
+    alert_id = 99999 if use_missing_id else seeded_alert_id
+    if as_reader:
+        app.dependency_overrides[require_api_key_write] = _read_only_actor
     try:
-        with session_scope() as session:
-            c = Customer(name="C", country="USA", base_risk=10.0)
-            session.add(c)
-            session.flush()
-            a = Account(customer_id=c.id, iban_or_acct="IBAN_RO")
-            session.add(a)
-            session.flush()
-            t = Transaction(
-                account_id=a.id,
-                ts=datetime.now(UTC),
-                amount=100.0,
-                currency="USD",
-            )
-            session.add(t)
-            session.flush()
-            alert = Alert(
-                transaction_id=t.id,
-                rule_id="R",
-                severity="high",
-                score=10.0,
-                reason="R",
-            )
-            session.add(alert)
-            session.flush()
-            alert_id = alert.id
-        resp = api_client.patch(
-            f"/alerts/{alert_id}",
-            json={"status": "closed"},
-            headers={"X-API-Key": "read_only_key"},
-        )
-        assert resp.status_code == 403
-        assert "scope" in resp.json().get(
-            "detail", ""
-        ).lower() or "Insufficient" in resp.json().get("detail", "")
+        resp = api_client.patch(f"/alerts/{alert_id}", json=body, headers=headers)
     finally:
-        os.environ["AML_API_KEYS"] = "admin:test_admin_key"
-
+        app.dependency_overrides.pop(require_api_key_write, None)
+    assert resp.status_code == expected_status
+    if expected_status == 403:
+        assert "Insufficient scope" in resp.json().get("detail", "")
+    elif expected_status != 200:
+        assert "detail" in resp.json()
 
-def test_write_key_succeeds_patch_alerts(api_client: TestClient) -> None:
-    """Key with default (read_write) scope can PATCH /alerts (200)."""
-    resp = api_client.patch(
-        "/alerts/1",
-        json={"status": "closed"},
-        headers=AUTH_HEADERS,
-    )
-    # 404 is ok (no alert 1); 200 if alert exists
-    assert resp.status_code in (200, 404)
 
-
-def test_protected_endpoint_without_key_returns_401(api_client: TestClient) -> None:
-    """PATCH /alerts/{id} without X-API-Key returns 401."""
-    resp = api_client.patch(
-        "/alerts/1",
-        json={"status": "closed"},
-    )
-    assert resp.status_code == 401
-    assert "detail" in resp.json()
-
-
-def test_protected_endpoint_with_invalid_key_returns_401(api_client: TestClient) -> None:
-    """PATCH /alerts/{id} with invalid X-API-Key returns 401."""
-    resp = api_client.patch(
-        "/alerts/1",
-        json={"status": "closed"},
-        headers={"X-API-Key": "invalid_key"},
-    )
-    assert resp.status_code == 401
-
-
-def test_actor_from_api_key_not_x_actor(api_client: TestClient) -> None:
+def test_actor_from_api_key_not_x_actor(api_client: TestClient, db_tx) -> None:
     """AuditLog actor is the authenticated identity from API key, not X-Actor header."""
-    with session_scope() as session:
-        c = Customer(name="SpoofC", country="USA", base_risk=10.0)
-        session.add(c)
-        session.flush()
-        a = Account(customer_id=c.id, iban_or_acct="IBAN_SPOOF")
-        session.add(a)
-        session.flush()
-        t = Transaction(
-            account_id=a.id,
-            ts=datetime.now(UTC),
-            amount=100.0,
-            currency="USD",
-        )
-        session.add(t)
-        session.flush()
-        alert = Alert(
-            transaction_id=t.id,
-            rule_id="R",
-            severity="high",
-            score=10.0,
-            reason="R",
-        )
-        session.add(alert)
-        session.flush()
-        alert_id = alert.id
+    (alert_id,) = seed_case_scenario(db_tx, iban="IBAN_SPOOF", name="SpoofC", n_alerts=1)
     # Valid key maps to "admin"; X-Actor spoof must be ignored
     api_client.patch(
         f"/alerts/{alert_id}",
@@ -601,11 +395,10 @@ def test_actor_from_api_key_not_x_actor(api_client: TestClient) -> None:
         headers={"X-API-Key": "test_admin_key", "X-Actor": "hacker"},
     )
     with session_scope() as session:
-        row = session.execute(
+        actor = session.execute(
             select(AuditLog.actor)
             .where(AuditLog.action == "disposition_update")
             .order_by(AuditLog.id.desc())
             .limit(1)
-        ).first()
-    assert row is not None
-    assert row[0] == "admin"
+        ).scalar()
+    assert actor == "admin"
@@ -2,21 +2,21 @@
 
 from __future__ import annotations
 
-import os
-
 import pytest
 import yaml
-from sqlalchemy import select, text
+from sqlalchemy import JSON, bindparam, select, text
 
+from aml_monitoring import db as db_module
 from aml_monitoring.audit_context import set_audit_context
 from aml_monitoring.db import init_db, session_scope
 from aml_monitoring.models import AuditLog
 
 
-@pytest.fixture
-def db_with_hash_columns(tmp_path):
-    """DB with AML_ALLOW_SCHEMA_UPGRADE so prev_hash/row_hash exist."""
-    os.environ["AML_ALLOW_SCHEMA_UPGRADE"] = "true"
+@pytest.fixture(scope="session")
+def _audit_chain_db(tmp_path_factory):
+    """One DB with AML_ALLOW_SCHEMA_UPGRADE so prev_hash/row_hash exist; built once per session.
+    Tests only append to audit_logs and select their own rows, so they can share it."""
+    tmp_path = tmp_path_factory.mktemp("audit_chain")
     url = f"sqlite:///{tmp_path / 'audit_chain.db'}"
     cfg = {
         "app": {"log_level": "INFO"},
@@ -25,11 +25,19 @@ def db_with_hash_columns(tmp_path):
     }
     config_path = tmp_path / "config.yaml"
     config_path.write_text(yaml.dump(cfg))
-    init_db(url, echo=False)
-    try:
-        yield url
-    finally:
-        os.environ.pop("AML_ALLOW_SCHEMA_UPGRADE", None)
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("AML_ALLOW_SCHEMA_UPGRADE", "true")
+        init_db(url, echo=False)
+    return db_module._engine, db_module._SessionLocal
+
+
+@pytest.fixture
+def db_with_hash_columns(_audit_chain_db, monkeypatch):
+    """Point session_scope() at the shared audit-chain DB (other tests may have re-run init_db)."""
+    engine, session_local = _audit_chain_db
+    monkeypatch.setattr(db_module, "_engine", engine)
+    monkeypatch.setattr(db_module, "_SessionLocal", session_local)
+    return engine
 
 
 def test_audit_log_has_prev_hash_and_row_hash(db_with_hash_columns) -> None:
@@ -46,7 +54,10 @@ def test_audit_log_has_prev_hash_and_row_hash(db_with_hash_columns) -> None:
         )
     with session_scope() as session:
         row = session.execute(
-            select(AuditLog.prev_hash, AuditLog.row_hash).order_by(AuditLog.id.desc()).limit(1)
+            select(AuditLog.prev_hash, AuditLog.row_hash)
+            .where(AuditLog.action == "test_action")
+            .order_by(AuditLog.id.desc())
+            .limit(1)
         ).first()
     assert row is not None
     assert row[1] is not None, "row_hash must be set"
@@ -58,20 +69,19 @@ def test_audit_chain_verification(db_with_hash_columns) -> None:
     set_audit_context("chain-two", "test")
     with session_scope() as session:
         session.add(AuditLog(action="first", entity_type="e", entity_id="1", actor="a"))
-    with session_scope() as session:
-        _ = session.execute(
-            select(AuditLog.row_hash, AuditLog.prev_hash).order_by(AuditLog.id).limit(1)
-        ).first()
     set_audit_context("chain-two", "test")
     with session_scope() as session:
         session.add(AuditLog(action="second", entity_type="e", entity_id="2", actor="a"))
     with session_scope() as session:
         rows = session.execute(
-            select(AuditLog.id, AuditLog.prev_hash, AuditLog.row_hash).order_by(AuditLog.id)
+            select(AuditLog.id, AuditLog.prev_hash, AuditLog.row_hash)
+            .where(AuditLog.action.in_(("first", "second")))
+            .order_by(AuditLog.id.desc())
+            .limit(2)
         ).fetchall()
-    assert len(rows) >= 2
-    first_row_hash = rows[0][2]
-    second_prev_hash = rows[1][1]
+    assert len(rows) == 2
+    second_prev_hash = rows[0][1]
+    first_row_hash = rows[1][2]
     assert second_prev_hash == first_row_hash, "Chain: second.prev_hash == first.row_hash"
 
 
@@ -91,22 +101,20 @@ def test_tampering_breaks_verification(db_with_hash_columns) -> None:
     with session_scope() as session:
         row = session.execute(
             select(AuditLog.id, AuditLog.row_hash, AuditLog.details_json)
+            .where(AuditLog.action == "sensitive")
             .order_by(AuditLog.id.desc())
             .limit(1)
         ).first()
     assert row is not None
     original_hash = row[1]
     # Tamper: update details_json directly in DB (bypassing ORM so we don't recompute row_hash)
-    url = db_with_hash_columns
-    from sqlalchemy import create_engine
-
-    engine = create_engine(url)
-    with engine.connect() as conn:
+    with db_with_hash_columns.begin() as conn:
         conn.execute(
-            text("UPDATE audit_logs SET details_json = :new WHERE id = :id"),
-            {"new": '{"value": 2}', "id": row[0]},
+            text("UPDATE audit_logs SET details_json = :new WHERE id = :id").bindparams(
+                bindparam("new", type_=JSON)
+            ),
+            {"new": {"value": 2}, "id": row[0]},
         )
-        conn.commit()
     with session_scope() as session:
         tampered = session.execute(
             select(AuditLog.row_hash, AuditLog.details_json).where(AuditLog.id == row[0])
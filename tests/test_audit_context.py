@@ -1,39 +1,39 @@
 """Tests for audit context (correlation_id and actor traceability)."""
 
+import pytest
+
 from aml_monitoring.audit_context import (
     get_actor,
     get_audit_context,
     get_correlation_id,
     set_audit_context,
 )
+from tests._uuid import _UUID_RE
 
 
-def test_set_and_get_context() -> None:
-    """When context is set, get_audit_context and get_correlation_id/get_actor return those values."""
-    set_audit_context("corr-123", "analyst")
-    cid, actor = get_audit_context()
-    assert cid == "corr-123"
-    assert actor == "analyst"
-    assert get_correlation_id() == "corr-123"
-    assert get_actor() == "analyst"
-
-
-def test_get_correlation_id_generated_when_unset() -> None:
-    """When correlation_id is not set, get_correlation_id returns a generated UUID."""
-    set_audit_context(None, "system")  # no correlation_id set
-    cid = get_correlation_id()
-    assert cid is not None
-    assert len(cid) == 36
-    assert cid.count("-") == 4  # UUID format
-
-
-def test_get_actor_default_system_when_unset() -> None:
-    """When actor is not set, get_actor returns 'system'."""
-    set_audit_context("x", None)
-    assert get_actor() == "system"
-    set_audit_context(None, None)
-    _, actor = get_audit_context()
-    assert actor == "system"
+@pytest.mark.parametrize(
+    "cid,actor,exp_cid_kind,exp_actor",
+    [
+        ("corr-123", "analyst", "exact", "analyst"),
+        (None, "system", "uuid", "system"),
+        ("x", None, "exact", "system"),
+        (None, None, "uuid", "system"),
+    ],
+)
+def test_audit_context_get_and_defaults(
+    cid: str | None, actor: str | None, exp_cid_kind: str, exp_actor: str
+) -> None:
+    """Set values are returned as-is; unset correlation_id yields a generated UUID and
+    unset actor defaults to 'system'."""
+    set_audit_context(cid, actor)
+    ctx_cid, ctx_actor = get_audit_context()
+    for got_cid in (ctx_cid, get_correlation_id()):
+        if exp_cid_kind == "exact":
+            assert got_cid == cid
+        else:
+            assert _UUID_RE.fullmatch(got_cid)
+    assert ctx_actor == exp_actor
+    assert get_actor() == exp_actor
 
 
 def test_correlation_id_stable_within_context() -> None:
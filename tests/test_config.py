@@ -1,14 +1,19 @@
 """Tests for config loading."""
 
+import importlib
 import os
-import subprocess
-import sys
 
 import pytest
+import yaml
 
 from aml_monitoring.config import (
+    YAML_DUMPER,
+    YAML_LOADER,
+    _clear_cache,
     _deep_merge,
     _default_config,
+    _load_yaml,
+    _resolve_config,
     get_config,
     validate_high_risk_country,
 )
@@ -21,6 +26,17 @@ def test_default_config() -> None:
     assert "database" in cfg
 
 
+def test_default_config_memoized_and_frozen(tmp_path) -> None:
+    """Defaults are built once and read-only; get_config hands out a mutable copy."""
+    cfg = _default_config()
+    assert _default_config() is cfg
+    with pytest.raises(TypeError):
+        cfg["app"]["log_level"] = "DEBUG"  # type: ignore[index]
+    loaded = get_config(str(tmp_path / "missing.yaml"))
+    loaded["app"]["log_level"] = "DEBUG"
+    assert _default_config()["app"]["log_level"] == "INFO"
+
+
 def test_deep_merge() -> None:
     base = {"a": 1, "b": {"x": 1, "y": 2}}
     override = {"b": {"y": 3}, "c": 4}
@@ -31,6 +47,52 @@ def test_deep_merge() -> None:
     assert out["c"] == 4
 
 
+def test_load_yaml_memoized_until_file_changes(tmp_path) -> None:
+    """Repeated loads reuse the parse; callers get private copies; edits invalidate the entry."""
+    path = tmp_path / "c.yaml"
+    path.write_text("a: 1\n")
+    first = _load_yaml(path)
+    first["a"] = 99
+    assert _load_yaml(path) == {"a": 1}
+    path.write_text("a: 22\n")
+    assert _load_yaml(path) == {"a": 22}
+
+
+def test_yaml_uses_libyaml_when_available() -> None:
+    """Loader/dumper are the C-accelerated safe variants when PyYAML was built with libyaml."""
+    if yaml.__with_libyaml__:
+        assert YAML_LOADER is yaml.CSafeLoader
+        assert YAML_DUMPER is yaml.CSafeDumper
+    data = {"rules": {"high_value": {"threshold_amount": 12.5}}, "name": "é"}
+    text = yaml.dump(data, Dumper=YAML_DUMPER, sort_keys=True, allow_unicode=True)
+    assert yaml.load(text, Loader=YAML_LOADER) == data
+
+
+def test_get_config_cached_per_file_and_env(
+    config_path: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Repeat calls hit the cache and return private copies; env overrides are part of the key."""
+    _clear_cache()
+    first = get_config(config_path)
+    first["rules"]["high_value"]["threshold_amount"] = 1
+    assert get_config(config_path)["rules"]["high_value"]["threshold_amount"] == 10000
+    assert _resolve_config.cache_info().hits == 1
+    monkeypatch.setenv("AML_LOG_LEVEL", "DEBUG")
+    assert get_config(config_path)["app"]["log_level"] == "DEBUG"
+
+
+def test_get_config_sees_same_size_rewrite(tmp_path) -> None:
+    """A rewrite keeping the size and mtime (one timestamp tick) is not served from the cache."""
+    path = tmp_path / "config.yaml"
+    path.write_text("app:\n  name: alpha\n")
+    st = os.stat(path)
+    assert get_config(str(path))["app"]["name"] == "alpha"
+    path.write_text("app:\n  name: omega\n")
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert os.stat(path).st_size == st.st_size
+    assert get_config(str(path))["app"]["name"] == "omega"
+
+
 def test_get_config_with_file(config_path: str) -> None:
     cfg = get_config(config_path)
     assert cfg["database"]["url"] == "sqlite:///:memory:"
@@ -91,15 +153,35 @@ def test_validate_high_risk_country_skips_when_disabled() -> None:
     )
 
 
-def test_rules_version_respects_env() -> None:
-    """AML_RULES_VERSION env is used when set (subprocess to avoid import-time cache)."""
-    env = {**os.environ, "AML_RULES_VERSION": "2.0.0"}
-    code = "from aml_monitoring import RULES_VERSION; assert RULES_VERSION == '2.0.0'"
-    result = subprocess.run(
-        [sys.executable, "-c", code],
-        env=env,
-        capture_output=True,
-        text=True,
-        timeout=10,
-    )
-    assert result.returncode == 0, (result.stdout or "") + (result.stderr or "")
+def test_validate_high_risk_country_memoized() -> None:
+    """Placeholder scan is cached per countries list; a cached hit still raises."""
+    from aml_monitoring.config import _first_placeholder
+
+    _first_placeholder.cache_clear()
+    bad = {"rules": {"high_risk_country": {"enabled": True, "countries": ["IR", " yy "]}}}
+    for _ in range(2):
+        with pytest.raises(ValueError, match="'YY'"):
+            validate_high_risk_country(bad)
+    assert _first_placeholder.cache_info().hits == 1
+
+
+def test_config_hash_distinguishes_key_types() -> None:
+    """Configs that only differ in key type (int vs str) hash differently; key order does not."""
+    from aml_monitoring.config import get_config_hash
+
+    a = {"rules": {"high_value": {"threshold_amount": 10000}}, "app": {"log_level": "INFO"}}
+    b = {"app": {"log_level": "INFO"}, "rules": {"high_value": {"threshold_amount": 10000}}}
+    assert get_config_hash(a) == get_config_hash(b)
+    assert get_config_hash({**a, "app": {"log_level": "DEBUG"}}) != get_config_hash(a)
+    assert get_config_hash({1: "a"}) != get_config_hash({"1": "a"})
+
+
+def test_rules_version_respects_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    """AML_RULES_VERSION env is used when set (in-process reload of the import-time constant)."""
+    import aml_monitoring
+
+    # Registered first so teardown restores the original value after the reload below.
+    monkeypatch.setattr(aml_monitoring, "RULES_VERSION", aml_monitoring.RULES_VERSION)
+    monkeypatch.setenv("AML_RULES_VERSION", "2.0.0")
+    importlib.reload(aml_monitoring)
+    assert aml_monitoring.RULES_VERSION == "2.0.0"
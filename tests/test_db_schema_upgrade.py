@@ -4,8 +4,9 @@ from pathlib import Path
 
 import pytest
 from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
 
-from aml_monitoring.db import _missing_columns, init_db
+from aml_monitoring.db import _missing_columns, bind_engine, get_engine, init_db
 
 
 def _create_old_schema_db(path: Path) -> None:
@@ -133,3 +134,46 @@ def test_schema_upgrade_runs_with_flag_and_adds_columns(
     assert "disposition" in alert_columns
     assert "updated_at" in alert_columns
     assert "correlation_id" in alert_columns
+
+
+def test_init_db_repeat_call_is_noop(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """A second init_db for the same URL keeps the bound engine and skips schema work."""
+    monkeypatch.delenv("AML_ALLOW_SCHEMA_UPGRADE", raising=False)
+    url = f"sqlite:///{tmp_path / 'repeat.db'}"
+    init_db(url, echo=False)
+    engine = get_engine()
+    init_db(url, echo=False)
+    assert get_engine() is engine
+
+
+def test_transactions_external_id_is_uniquely_indexed(tmp_path: Path) -> None:
+    """Idempotent ingest and reingest counts rely on a unique index over external_id."""
+    url = f"sqlite:///{tmp_path / 'idx.db'}"
+    init_db(url, echo=False)
+    with get_engine().connect() as conn:
+        indexes = conn.execute(text("PRAGMA index_list(transactions)")).fetchall()
+        unique_cols = set()
+        for row in indexes:
+            if row[2]:
+                cols = conn.execute(text(f"PRAGMA index_info({row[1]})")).fetchall()
+                unique_cols.update(c[2] for c in cols)
+    assert "external_id" in unique_cols
+
+
+def test_file_sqlite_engine_uses_wal_pragmas(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Without the test-only fast pragmas, file-backed SQLite connects in WAL/NORMAL mode."""
+    monkeypatch.setenv("AML_TEST_FAST_PRAGMAS", "0")
+    init_db(f"sqlite:///{tmp_path / 'wal.db'}", echo=False)
+    with get_engine().connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+
+
+def test_static_pool_only_for_uri_memory_databases(tmp_path: Path) -> None:
+    """StaticPool is chosen from the parsed query, not a "mode=memory" substring in the path."""
+    bind_engine(f"sqlite:///{tmp_path / 'mode=memory.db'}", echo=False)
+    assert not isinstance(get_engine().pool, StaticPool)
+    bind_engine("sqlite:///file:static_pool_check?mode=memory&cache=shared&uri=true", echo=False)
+    assert isinstance(get_engine().pool, StaticPool)
@@ -2,7 +2,18 @@
 
 from datetime import UTC, datetime
 
-from aml_monitoring.ingest._idempotency import compute_external_id
+from sqlalchemy import event
+
+from aml_monitoring.ingest._idempotency import (
+    _IN_CHUNK_SIZE,
+    DEFAULT_BATCH_SIZE,
+    _copy_field,
+    compute_external_id,
+    ensure_accounts,
+    insert_new_transactions,
+    resolve_batch_size,
+)
+from aml_monitoring.models import Account
 
 
 def _ts(iso: str) -> datetime:
@@ -78,3 +89,74 @@ def test_external_id_different_inputs_different_id() -> None:
     assert compute_external_id(1, base[1], base[2], "EUR", base[4], base[5]) != base_id
     assert compute_external_id(1, base[1], base[2], base[3], "other", base[5]) != base_id
     assert compute_external_id(1, base[1], base[2], base[3], base[4], "in") != base_id
+
+
+def test_external_id_pinned_digests() -> None:
+    """Canonical payload is a stable contract: stored external_ids must not drift."""
+    assert (
+        compute_external_id(42, _ts("2025-01-01T10:00:00Z"), 2.675, " usd ", " Acme ", "OUT")
+        == "c5a48a8e5055abe6febfa3ae52c1fdf1b57b0f6e9b1645239d45e49a007f238d"
+    )
+    assert (
+        compute_external_id(7, datetime(2025, 1, 1, 10, 0), 1e20, "EUR", None, None)
+        == "69a2adaa4c44dad3a2639b61a1612e72171f0bcfbf647ea7756f85f5cc459113"
+    )
+
+
+def test_insert_new_transactions_skips_existing_external_ids(
+    db_session, sample_customer_and_account
+) -> None:
+    """Conflicting external_ids are skipped by the DB; only new rows are counted."""
+    _, account_id = sample_customer_and_account
+    ts = _ts("2025-01-01T10:00:00Z")
+    rows = [
+        {"external_id": f"ext-{i}", "account_id": account_id, "ts": ts, "amount": 10.0 * i}
+        for i in range(3)
+    ]
+    assert insert_new_transactions(db_session, rows) == 3
+    assert insert_new_transactions(db_session, [*rows, {**rows[0], "external_id": "ext-3"}]) == 1
+
+
+def test_ensure_accounts_chunks_lookup_for_large_batches(
+    db_session, sample_customer_and_account
+) -> None:
+    """A batch with more accounts than one IN (...) may bind is looked up in chunks."""
+    _, existing_id = sample_customer_and_account
+    ibans = [f"GB{i:08d}" for i in range(_IN_CHUNK_SIZE + 100)]
+    ibans.insert(_IN_CHUNK_SIZE + 50, "US123456")  # known account in the second chunk
+    batch = [
+        {"iban_or_acct": iban, "customer_name": iban, "country": "GBR", "base_risk": 10.0}
+        for iban in ibans
+    ]
+    lookups: list[int] = []
+
+    def _count_binds(conn, cursor, statement, parameters, context, executemany) -> None:
+        if statement.lstrip().upper().startswith("SELECT") and "accounts" in statement:
+            lookups.append(len(parameters))
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", _count_binds)
+    try:
+        ids = ensure_accounts(db_session, batch)
+    finally:
+        event.remove(engine, "before_cursor_execute", _count_binds)
+    assert lookups == [_IN_CHUNK_SIZE, 101]
+    assert set(ids) == set(ibans)
+    assert ids["US123456"] == existing_id
+    assert db_session.query(Account).count() == len(ibans)
+
+
+def test_copy_field_distinguishes_null_from_empty() -> None:
+    """Postgres COPY (csv) fields: NULL is bare, values are quoted with doubled quotes."""
+    assert _copy_field(None) == ""
+    assert _copy_field("") == '""'
+    assert _copy_field('say "hi", ok') == '"say ""hi"", ok"'
+    assert _copy_field(datetime(2025, 1, 1, 10, 0)) == '"2025-01-01T10:00:00"'
+    assert _copy_field(12.5) == '"12.5"'
+
+
+def test_resolve_batch_size_caller_then_config_then_default() -> None:
+    """CSV and JSONL ingest share one batch_size resolution."""
+    assert resolve_batch_size(10, {"batch_size": 200}) == 10
+    assert resolve_batch_size(None, {"batch_size": "200"}) == 200
+    assert resolve_batch_size(None, {}) == DEFAULT_BATCH_SIZE
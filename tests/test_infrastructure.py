@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import os
 from datetime import UTC, datetime
 from pathlib import Path
 
@@ -10,8 +9,7 @@ import pytest
 from fastapi.testclient import TestClient
 
 from aml_monitoring.api import app
-from aml_monitoring.config import get_config
-from aml_monitoring.db import init_db, session_scope
+from aml_monitoring.db import session_scope
 from aml_monitoring.models import Account, Alert, Case, Customer, Transaction
 from aml_monitoring.pagination import decode_cursor, encode_cursor, paginate_query
 from aml_monitoring.security import reset_rate_limits
@@ -20,18 +18,18 @@ AUTH_HEADERS = {"X-API-Key": "test_admin_key"}
 
 
 @pytest.fixture
-def infra_client(tmp_path: Path):
+def infra_client(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, fresh_db):
     """TestClient with fresh DB for infrastructure tests."""
     reset_rate_limits()
-    os.environ["AML_API_KEYS"] = "admin:test_admin_key"
-    db_file = tmp_path / "infra_test.db"
+    monkeypatch.setenv("AML_API_KEYS", "admin:test_admin_key")
+    db_url = fresh_db("infra_test.db")
     config_file = tmp_path / "infra_config.yaml"
     config_file.write_text(
         f"""
 app:
   log_level: INFO
 database:
-  url: "sqlite:///{db_file}"
+  url: "{db_url}"
   echo: false
 rules:
   high_value:
@@ -46,13 +44,8 @@ scoring:
   thresholds: {{ low: 33, medium: 66, high: 100 }}
 """
     )
-    os.environ["AML_CONFIG_PATH"] = str(config_file)
-    try:
-        cfg = get_config(str(config_file))
-        init_db(cfg["database"]["url"], echo=False)
-        yield TestClient(app)
-    finally:
-        os.environ.pop("AML_CONFIG_PATH", None)
+    monkeypatch.setenv("AML_CONFIG_PATH", str(config_file))
+    return TestClient(app)
 
 
 # ---------------------------------------------------------------------------
@@ -1,5 +1,7 @@
 """Tests for ingest reject visibility: bad rows are counted and reasons persisted in audit."""
 
+import json
+from datetime import datetime
 from pathlib import Path
 
 import pytest
@@ -7,38 +9,33 @@ import yaml
 from sqlalchemy import select
 
 from aml_monitoring.audit_context import set_audit_context
-from aml_monitoring.db import init_db, session_scope
+from aml_monitoring.config import YAML_DUMPER
+from aml_monitoring.db import session_scope
 from aml_monitoring.ingest import ingest_csv, ingest_jsonl
+from aml_monitoring.ingest.schema import _parse_ts, normalize_row, row_normalizer
 from aml_monitoring.models import AuditLog
 
+DATA_DIR = Path(__file__).parent / "data"
+
+
+# Dumped once; each test substitutes its DB URL (JSON-quoted, which is a valid YAML scalar).
+_CFG_TEMPLATE = yaml.dump(
+    {"app": {"log_level": "INFO"}, "database": {"url": "__URL__", "echo": False}, "rules": {}},
+    Dumper=YAML_DUMPER,
+)
+
 
 @pytest.fixture
-def config_with_db(tmp_path: Path) -> str:
-    url = f"sqlite:///{tmp_path / 'reject_test.db'}"
-    cfg = {
-        "app": {"log_level": "INFO"},
-        "database": {"url": url, "echo": False},
-        "rules": {},
-    }
+def config_with_db(tmp_path: Path, fresh_db) -> str:
+    url = fresh_db("reject_test.db")
     config_path = tmp_path / "config.yaml"
-    config_path.write_text(yaml.dump(cfg))
-    init_db(url, echo=False)
+    config_path.write_text(_CFG_TEMPLATE.replace("__URL__", json.dumps(url)))
     return str(config_path)
 
 
-def test_csv_ingest_rejects_missing_iban_audit_has_reject_reasons(
-    config_with_db: str, tmp_path: Path
-) -> None:
+def test_csv_ingest_rejects_missing_iban_audit_has_reject_reasons(config_with_db: str) -> None:
     """Rows with missing iban_or_acct are rejected and reasons persisted in ingest audit."""
-    csv_path = tmp_path / "dirty.csv"
-    csv_path.write_text(
-        """customer_name,country,iban_or_acct,ts,amount,currency,merchant,counterparty,country_txn,channel,direction,base_risk
-Alice,USA,IBAN001,2025-01-01T10:00:00,1000,USD,M,CP,USA,wire,out,10
-Bob,GBR,,2025-01-01T11:00:00,500,USD,M2,CP2,GBR,wire,out,10
-Carol,FRA,,2025-01-01T12:00:00,600,USD,M3,CP3,FRA,wire,out,10
-Dave,DEU,IBAN002,2025-01-01T13:00:00,700,USD,M4,CP4,DEU,wire,out,10
-"""
-    )
+    csv_path = DATA_DIR / "ingest_rejects_missing_iban.csv"
     set_audit_context("reject-test-csv", "test-actor")
     read, inserted = ingest_csv(str(csv_path), config_path=config_with_db)
     assert read == 4
@@ -63,18 +60,9 @@ Dave,DEU,IBAN002,2025-01-01T13:00:00,700,USD,M4,CP4,DEU,wire,out,10
     assert all(r == "missing_iban" for r in reasons)
 
 
-def test_csv_ingest_rejects_parse_error_audit_has_reject_reasons(
-    config_with_db: str, tmp_path: Path
-) -> None:
+def test_csv_ingest_rejects_parse_error_audit_has_reject_reasons(config_with_db: str) -> None:
     """Rows with invalid ts or amount are rejected and parse_error reason persisted."""
-    csv_path = tmp_path / "bad_parse.csv"
-    csv_path.write_text(
-        """customer_name,country,iban_or_acct,ts,amount,currency,merchant,counterparty,country_txn,channel,direction,base_risk
-Alice,USA,IBAN001,2025-01-01T10:00:00,1000,USD,M,CP,USA,wire,out,10
-Bob,GBR,IBAN002,not-a-date,500,USD,M2,CP2,GBR,wire,out,10
-Carol,FRA,IBAN003,2025-01-01T12:00:00,not-a-number,USD,M3,CP3,FRA,wire,out,10
-"""
-    )
+    csv_path = DATA_DIR / "ingest_rejects_bad_parse.csv"
     set_audit_context("reject-parse-csv", "test-actor")
     read, inserted = ingest_csv(str(csv_path), config_path=config_with_db)
     assert read == 3
@@ -94,16 +82,9 @@ Carol,FRA,IBAN003,2025-01-01T12:00:00,not-a-number,USD,M3,CP3,FRA,wire,out,10
     assert any("parse_error" in r for r in details["reject_reasons"])
 
 
-def test_csv_ingest_no_rejects_when_all_valid_audit_has_no_reject_keys(
-    config_with_db: str, tmp_path: Path
-) -> None:
+def test_csv_ingest_no_rejects_when_all_valid_audit_has_no_reject_keys(config_with_db: str) -> None:
     """When no rows are rejected, details_json does not include rows_rejected or reject_reasons."""
-    csv_path = tmp_path / "all_valid.csv"
-    csv_path.write_text(
-        """customer_name,country,iban_or_acct,ts,amount,currency,merchant,counterparty,country_txn,channel,direction,base_risk
-Alice,USA,IBAN001,2025-01-01T10:00:00,1000,USD,M,CP,USA,wire,out,10
-"""
-    )
+    csv_path = DATA_DIR / "ingest_rejects_all_valid.csv"
     set_audit_context("no-reject-csv", "test-actor")
     read, inserted = ingest_csv(str(csv_path), config_path=config_with_db)
     assert read == 1 and inserted == 1
@@ -123,14 +104,9 @@ Alice,USA,IBAN001,2025-01-01T10:00:00,1000,USD,M,CP,USA,wire,out,10
     assert "reject_reasons" not in details
 
 
-def test_jsonl_ingest_rejects_audit_has_reject_reasons(config_with_db: str, tmp_path: Path) -> None:
+def test_jsonl_ingest_rejects_audit_has_reject_reasons(config_with_db: str) -> None:
     """JSONL: missing iban and parse errors produce rows_rejected and reject_reasons in audit."""
-    jsonl_path = tmp_path / "dirty.jsonl"
-    jsonl_path.write_text(
-        '{"customer_name":"A","country":"USA","iban_or_acct":"IB1","ts":"2025-01-01T10:00:00","amount":100,"currency":"USD"}\n'
-        "{}\n"
-        '{"customer_name":"B","country":"GBR","iban_or_acct":"","ts":"2025-01-01T11:00:00","amount":200,"currency":"USD"}\n'
-    )
+    jsonl_path = DATA_DIR / "ingest_rejects_dirty.jsonl"
     set_audit_context("reject-jsonl", "test-actor")
     read, inserted = ingest_jsonl(str(jsonl_path), config_path=config_with_db)
     assert read == 3
@@ -149,3 +125,36 @@ def test_jsonl_ingest_rejects_audit_has_reject_reasons(config_with_db: str, tmp_
     assert details["rows_rejected"] == 2
     assert "reject_reasons" in details
     assert len(details["reject_reasons"]) == 2
+
+
+def test_row_normalizer_matches_normalize_row() -> None:
+    """Per-file normalizer applies the same coercions (incl. minor units) and parse errors."""
+    column_map = {"acct": "iban_or_acct", "when": "ts", "amount_minor": "amount"}
+    normalize = row_normalizer(column_map)
+    row = {"acct": " IB1 ", "when": "2025-01-01T10:00:00", "amount_minor": "12345"}
+    assert normalize(row) == normalize_row(row, column_map)
+    assert normalize(row)[0]["amount"] == 123.45
+    with pytest.raises(ValueError, match="invalid amount"):
+        normalize({**row, "amount_minor": "abc"})
+
+
+@pytest.mark.parametrize(
+    ("raw", "expected"),
+    [
+        ("2025-01-01T10:05:07", datetime(2025, 1, 1, 10, 5, 7)),
+        ("2025-01-01 10:05:07", datetime(2025, 1, 1, 10, 5, 7)),
+        ("2025-01-01T10:05:07.250Z", datetime(2025, 1, 1, 10, 5, 7)),
+        ("2025-01-01", datetime(2025, 1, 1)),
+        ("01/02/2025 10:05:07", datetime(2025, 2, 1, 10, 5, 7)),
+    ],
+)
+def test_parse_ts_iso_fast_path_matches_formats(raw: str, expected: datetime) -> None:
+    """ISO timestamps skip the strptime loop but parse to the same naive datetimes."""
+    assert _parse_ts(raw) == expected
+
+
+def test_parse_ts_rejects_offsets_partial_times_and_week_dates() -> None:
+    """The fast path does not widen accepted inputs beyond the strptime formats."""
+    for raw in ("2025-01-01T10:00+01", "2025-01-01T10:00", "2025-W01-1T10:00:00"):
+        with pytest.raises(ValueError, match="Cannot parse datetime"):
+            _parse_ts(raw)
@@ -1,6 +1,7 @@
 """Integration tests: DB, ingest, run_rules, report, idempotency, audit."""
 
 import json
+import uuid
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
 
@@ -19,6 +20,11 @@ from aml_monitoring.reproduce import reproduce_run
 from aml_monitoring.run_rules import run_rules
 
 
+def _memory_db_url(name: str) -> str:
+    """Named in-memory SQLite URL; db.bind_engine serves it from one StaticPool connection."""
+    return f"sqlite:///file:{name}_{uuid.uuid4().hex}?mode=memory&cache=shared&uri=true"
+
+
 @pytest.fixture
 def sample_csv(tmp_path: Path) -> Path:
     p = tmp_path / "sample.csv"
@@ -33,9 +39,8 @@ Bob,GBR,IBAN002,2025-01-01T11:00:00,15000,USD,Merchant B,CP B,GBR,wire,out,10
 
 @pytest.fixture
 def integration_config(tmp_path: Path) -> str:
-    """Config file that uses a file-based SQLite DB in tmp_path."""
-    db_path = tmp_path / "test.db"
-    url = f"sqlite:///{db_path}"
+    """Config file (in tmp_path) that uses a private in-memory SQLite DB."""
+    url = _memory_db_url("integration")
     cfg = {
         "app": {"log_level": "INFO"},
         "database": {"url": url, "echo": False},
@@ -78,12 +83,16 @@ def test_reingest_same_file_twice_no_new_rows(sample_csv: Path, integration_conf
     assert read1 == 2 and inserted1 == 2
 
     with session_scope() as session:
-        count_after_first = session.execute(select(func.count(Transaction.id))).scalar_one()
+        count_after_first = session.execute(
+            select(func.count()).select_from(Transaction)
+        ).scalar_one()
     read2, inserted2 = ingest_csv(str(sample_csv), batch_size=10, config_path=integration_config)
     assert read2 == 2 and inserted2 == 0
 
     with session_scope() as session:
-        count_after_second = session.execute(select(func.count(Transaction.id))).scalar_one()
+        count_after_second = session.execute(
+            select(func.count()).select_from(Transaction)
+        ).scalar_one()
     assert count_after_second == count_after_first
 
 
@@ -118,7 +127,7 @@ Alice,USA,IBAN001,2025-01-01T10:00:00,1000.1,USD,M,cp a,USA,wire,out,10
     read2, inserted2 = ingest_csv(str(csv2), config_path=integration_config)
     assert read2 == 1 and inserted2 == 0
     with session_scope() as session:
-        count = session.execute(select(func.count(Transaction.id))).scalar_one()
+        count = session.execute(select(func.count()).select_from(Transaction)).scalar_one()
         ext_id2 = (
             session.execute(
                 select(Transaction.external_id).where(Transaction.external_id.isnot(None)).limit(1)
@@ -311,8 +320,7 @@ def test_sar_report_includes_timeliness_and_hours_to_disposition(
 
 def test_network_ring_indicator_integration(tmp_path: Path) -> None:
     """Build network from two accounts sharing counterparties; run rules; assert NetworkRingIndicator alert and audit."""
-    db_path = tmp_path / "network_test.db"
-    url = f"sqlite:///{db_path}"
+    url = _memory_db_url("network_test")
     cfg = {
         "app": {"log_level": "INFO"},
         "database": {"url": url, "echo": False},
@@ -8,7 +8,7 @@ import networkx as nx
 import pytest
 from fastapi.testclient import TestClient
 
-from aml_monitoring.db import init_db, session_scope
+from aml_monitoring.db import session_scope
 from aml_monitoring.models import (
     Account,
     Alert,
@@ -24,11 +24,9 @@ from aml_monitoring.models import (
 # ---------------------------------------------------------------------------
 
 @pytest.fixture(autouse=True)
-def _setup_db(tmp_path):
+def _setup_db(fresh_db):
     """Initialize a fresh in-memory DB for each test."""
-    db_url = f"sqlite:///{tmp_path}/test.db"
-    init_db(db_url, echo=False)
-    yield
+    fresh_db("test.db")
 
 
 def _seed_ring_network(session) -> dict[str, list[int]]:
@@ -656,3 +654,12 @@ class TestRingStructures:
         a1_id, a4_id = ids["account_ids"][0], ids["account_ids"][3]
         path = find_shortest_path(graph, a1_id, a4_id)
         assert path == []
+
+    def test_ring_index_matches_ring_signal(self):
+        from aml_monitoring.network.metrics import RingIndex, ring_signal
+
+        with session_scope() as session:
+            ids = _seed_ring_network(session)
+            index = RingIndex(session, lookback_days=30)
+            for account_id in [*ids["account_ids"], -1]:
+                assert index.signal(account_id) == ring_signal(account_id, session, 30)
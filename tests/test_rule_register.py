@@ -2,36 +2,35 @@
 
 from __future__ import annotations
 
-import subprocess
-import sys
+import importlib.util
 from pathlib import Path
 
+import pytest
+
 
 def _repo_root() -> Path:
     return Path(__file__).resolve().parent.parent
 
 
-def test_rule_register_valid_from_repo_root() -> None:
-    """Running validate_rule_register.py from repo root must succeed (current repo state)."""
-    root = _repo_root()
-    result = subprocess.run(
-        [sys.executable, "scripts/validate_rule_register.py"],
-        cwd=root,
-        capture_output=True,
-        text=True,
-    )
-    assert result.returncode == 0, (result.stdout or "") + (result.stderr or "")
-
-
-def test_rule_register_fails_when_missing(tmp_path: Path) -> None:
-    """When docs/rule_register.csv is missing, validator exits non-zero."""
-    root = _repo_root()
-    script = root / "scripts" / "validate_rule_register.py"
-    # Run script with cwd=temp dir so it looks for docs/rule_register.csv in temp (missing)
-    result = subprocess.run(
-        [sys.executable, str(script)],
-        cwd=tmp_path,
-        capture_output=True,
-        text=True,
-    )
-    assert result.returncode != 0
+def _validator_main():
+    """Load scripts/validate_rule_register.py in-process (scripts/ is not a package)."""
+    script = _repo_root() / "scripts" / "validate_rule_register.py"
+    spec = importlib.util.spec_from_file_location("validate_rule_register", script)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.main
+
+
+def test_rule_register_valid_from_repo_root(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Running the validator from repo root must succeed (current repo state)."""
+    monkeypatch.chdir(_repo_root())
+    assert _validator_main()() == 0, capsys.readouterr().out
+
+
+def test_rule_register_fails_when_missing(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """When docs/rule_register.csv is missing, validator returns non-zero."""
+    # cwd=temp dir so it looks for docs/rule_register.csv in temp (missing)
+    monkeypatch.chdir(tmp_path)
+    assert _validator_main()() != 0
@@ -28,6 +28,15 @@ def _ctx(
     )
 
 
+def test_rule_context_is_slotted() -> None:
+    """RuleContext keeps a fixed slot layout (no per-instance __dict__) and stays mutable
+    so run_rules can reuse one instance per chunk."""
+    ctx = _ctx()
+    assert not hasattr(ctx, "__dict__")
+    ctx.amount = 2_000.0
+    assert ctx.amount == 2_000.0
+
+
 def test_high_value_above_threshold() -> None:
     rule = HighValueTransactionRule({"threshold_amount": 10_000})
     results = rule.evaluate(_ctx(amount=15_000))
@@ -55,6 +64,15 @@ def test_sanctions_keyword_no_match() -> None:
     assert len(results) == 0
 
 
+def test_sanctions_keyword_reports_first_configured_keyword() -> None:
+    """With several keywords present, evidence names the first in config order; none -> no hit."""
+    rule = SanctionsKeywordRule({"keywords": ["ofac", "Sanctioned", "a.c"]})
+    results = rule.evaluate(_ctx(counterparty="Sanctioned OFAC list"))
+    assert [r.evidence_fields["keyword"] for r in results] == ["ofac"]
+    assert rule.evaluate(_ctx(counterparty="abc")) == []  # keywords are literals, not regex
+    assert SanctionsKeywordRule({"keywords": []}).evaluate(_ctx(counterparty="ofac")) == []
+
+
 def test_high_risk_country_match() -> None:
     rule = HighRiskCountryRule({"countries": ["IR", "XX"]})
     results = rule.evaluate(_ctx(country="IR"))
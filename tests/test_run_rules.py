@@ -2,25 +2,32 @@
 
 from __future__ import annotations
 
+from datetime import UTC, datetime
+from types import SimpleNamespace
+
 import yaml
-from sqlalchemy import select
+from sqlalchemy import select, text
 
 from aml_monitoring.audit_context import set_audit_context
-from aml_monitoring.db import init_db, session_scope
+from aml_monitoring.db import session_scope
 from aml_monitoring.ingest import ingest_csv
-from aml_monitoring.models import Alert
-from aml_monitoring.run_rules import run_rules
+from aml_monitoring.models import Account, Alert, AuditLog, Transaction
+from aml_monitoring.rules.base import RuleContext
+from aml_monitoring.rules.high_risk_country import HighRiskCountryRule
+from aml_monitoring.rules.high_value import HighValueTransactionRule
+from aml_monitoring.rules.sanctions_keyword import SanctionsKeywordRule
+from aml_monitoring.run_rules import AlertChunkedInsert, _compile_rule_dispatch, run_rules
 
 
 def _seed_txns_and_run(
     tmp_path,
+    fresh_db,
     config_overrides: dict | None = None,
     chunk_size: int = 0,
     resume_from_correlation_id: str | None = None,
 ) -> tuple[str, int, int]:
     """Seed DB with small CSV, run_rules with given chunk_size/resume; return (correlation_id, processed, alerts)."""
-    db_path = tmp_path / "run_rules_test.db"
-    url = f"sqlite:///{db_path}"
+    url = fresh_db("run_rules_test.db")
     cfg = {
         "app": {"log_level": "INFO"},
         "database": {"url": url, "echo": False},
@@ -44,7 +51,6 @@ def _seed_txns_and_run(
         cfg.update(config_overrides)
     config_path = tmp_path / "config.yaml"
     config_path.write_text(yaml.dump(cfg))
-    init_db(url, echo=False)
 
     csv_path = tmp_path / "data.csv"
     csv_path.write_text(
@@ -64,10 +70,9 @@ def _seed_txns_and_run(
     return cid, processed, alerts
 
 
-def test_chunk_sizes_produce_identical_alerts(tmp_path) -> None:
+def test_chunk_sizes_produce_identical_alerts(tmp_path, fresh_db) -> None:
     """Different chunk_size (0 vs 2) produces same set of (transaction_id, rule_id)."""
-    db_path = tmp_path / "db.db"
-    url = f"sqlite:///{db_path}"
+    url = fresh_db("db.db")
     cfg = {
         "app": {"log_level": "INFO"},
         "database": {"url": url, "echo": False},
@@ -94,7 +99,6 @@ def test_chunk_sizes_produce_identical_alerts(tmp_path) -> None:
         "Bob,IR,IBAN2,2025-01-01T11:00:00,500,USD,M2,sanctioned,IR,wire,out,10\n"
         "Carol,USA,IBAN3,2025-01-01T12:00:00,15000,USD,M3,CP3,USA,wire,out,10\n"
     )
-    init_db(url, echo=False)
 
     # Run with no chunking
     cfg["run_rules"] = {"chunk_size": 0}
@@ -103,31 +107,26 @@ def test_chunk_sizes_produce_identical_alerts(tmp_path) -> None:
     ingest_csv(str(csv_path), config_path=str(config_path))
     run_rules(config_path=str(config_path))
     with session_scope() as session:
-        set_no = {
-            (a.transaction_id, a.rule_id) for a in session.execute(select(Alert)).scalars().all()
-        }
+        set_no = set(session.execute(select(Alert.transaction_id, Alert.rule_id)).tuples())
 
-    # Fresh DB, run with chunk_size=2
-    init_db(url, echo=False)
+    # Fresh DB (template copy, no DDL or engine re-init), run with chunk_size=2
+    cfg["database"]["url"] = fresh_db("db_chunk2.db")
     cfg["run_rules"] = {"chunk_size": 2}
     config_path.write_text(yaml.dump(cfg))
     set_audit_context("cid-chunk2", "test")
     ingest_csv(str(csv_path), config_path=str(config_path))
     run_rules(config_path=str(config_path))
     with session_scope() as session:
-        set_chunk = {
-            (a.transaction_id, a.rule_id) for a in session.execute(select(Alert)).scalars().all()
-        }
+        set_chunk = set(session.execute(select(Alert.transaction_id, Alert.rule_id)).tuples())
 
     assert (
         set_no == set_chunk
     ), "Chunked and non-chunked runs must produce same (transaction_id, rule_id) set"
 
 
-def test_resume_no_duplicates_no_skips(tmp_path) -> None:
+def test_resume_no_duplicates_no_skips(tmp_path, fresh_db) -> None:
     """Resume from checkpoint produces same total alerts and no duplicate (txn_id, rule_id)."""
-    db_path = tmp_path / "db2.db"
-    url = f"sqlite:///{db_path}"
+    url = fresh_db("db2.db")
     cfg = {
         "app": {"log_level": "INFO"},
         "database": {"url": url, "echo": False},
@@ -156,16 +155,16 @@ def test_resume_no_duplicates_no_skips(tmp_path) -> None:
         "Bob,IR,IBAN2,2025-01-01T11:00:00,500,USD,M2,sanctioned,IR,wire,out,10\n"
         "Carol,USA,IBAN3,2025-01-01T12:00:00,15000,USD,M3,CP3,USA,wire,out,10\n"
     )
-    init_db(url, echo=False)
     cid = "resume-test-cid"
     set_audit_context(cid, "test")
     ingest_csv(str(csv_path), config_path=str(config_path))
     run_rules(config_path=str(config_path), resume_from_correlation_id=None)
     with session_scope() as session:
-        alerts_full = list(
-            session.execute(select(Alert).where(Alert.correlation_id == cid)).scalars().all()
+        set_full = set(
+            session.execute(
+                select(Alert.transaction_id, Alert.rule_id).where(Alert.correlation_id == cid)
+            ).tuples()
         )
-        set_full = {(a.transaction_id, a.rule_id) for a in alerts_full}
 
     # Simulate resume: delete alerts after first chunk (we can't easily "stop" mid-run, so instead we run once
     # with chunk_size=2, then run again with resume - second run should only process remaining txns and not duplicate)
@@ -192,3 +191,211 @@ def test_resume_no_duplicates_no_skips(tmp_path) -> None:
     set_after = {(r[0], r[1]) for r in alerts_after_rows}
     assert len(set_after) == len(set_full), "Resume must not duplicate alerts"
     assert set_after == set_full, "Resume must not change alert set"
+
+
+def test_bulk_inserted_alerts_get_column_defaults(tmp_path, fresh_db) -> None:
+    """Alerts written by the per-chunk executemany still get status/created_at defaults."""
+    cid, processed, alerts = _seed_txns_and_run(tmp_path, fresh_db, chunk_size=2)
+    assert processed == 3
+    with session_scope() as session:
+        rows = session.execute(
+            select(Alert.status, Alert.created_at, Alert.evidence_fields, Alert.correlation_id)
+        ).all()
+    assert len(rows) == alerts >= 1
+    for status, created_at, evidence, correlation_id in rows:
+        assert status == "open"
+        assert created_at is not None
+        assert "rule_hash" in evidence
+        assert correlation_id == cid
+
+
+def test_run_rules_scores_every_transaction(tmp_path, fresh_db) -> None:
+    """Each transaction gets its risk score and run provenance from the chunk's bulk UPDATE."""
+    _seed_txns_and_run(tmp_path, fresh_db, chunk_size=2)
+    with session_scope() as session:
+        rows = session.execute(
+            select(Account.iban_or_acct, Transaction.risk_score, Transaction.rules_version)
+            .join(Account, Account.id == Transaction.account_id)
+            .order_by(Transaction.id)
+        ).all()
+    assert [(iban, score) for iban, score, _ in rows] == [
+        ("IBAN1", 10.0),  # base only
+        ("IBAN2", 65.0),  # base + sanctions keyword 30 + high-risk country 25
+        ("IBAN3", 35.0),  # base + high value 25
+    ]
+    assert all(version is not None for _, _, version in rows)
+
+
+def test_run_rules_scores_transactions_with_missing_account_or_customer(tmp_path, fresh_db) -> None:
+    """Orphaned rows are scored with the configured base risk and do not end the run early."""
+    _seed_txns_and_run(tmp_path, fresh_db, chunk_size=2)
+    with session_scope() as session:
+        # SQLite does not enforce foreign keys (no PRAGMA foreign_keys), so such orphans can exist.
+        session.execute(text("DELETE FROM accounts WHERE iban_or_acct = 'IBAN1'"))
+        session.execute(
+            text(
+                "DELETE FROM customers WHERE id = "
+                "(SELECT customer_id FROM accounts WHERE iban_or_acct = 'IBAN3')"
+            )
+        )
+        session.execute(text("UPDATE transactions SET risk_score = NULL"))
+    config_path = str(tmp_path / "config.yaml")
+    set_audit_context("test-run-rules-orphans", "test")
+    processed, _ = run_rules(config_path=config_path)
+    assert processed == 3
+    with session_scope() as session:
+        scores = session.execute(select(Transaction.risk_score).order_by(Transaction.id)).scalars()
+        assert list(scores) == [10.0, 65.0, 35.0]
+
+
+def test_run_rules_writes_one_checkpoint_per_chunk(tmp_path, fresh_db) -> None:
+    """Audit checkpoints are per chunk (2 + 1 txns -> 2 rows), not per transaction."""
+    cid, processed, _ = _seed_txns_and_run(tmp_path, fresh_db, chunk_size=2)
+    with session_scope() as session:
+        details = (
+            session.execute(
+                select(AuditLog.details_json)
+                .where(AuditLog.correlation_id == cid, AuditLog.action == "run_rules")
+                .order_by(AuditLog.id)
+            )
+            .scalars()
+            .all()
+        )
+    assert processed == 3
+    assert [(d["chunk_index"], d["processed"]) for d in details] == [(0, 2), (1, 3)]
+    assert details[0]["last_processed_id"] < details[1]["last_processed_id"]
+
+
+def test_rebuild_indexes_restores_alert_indexes(tmp_path, fresh_db) -> None:
+    """With run_rules.rebuild_indexes, alerts match a normal run and indexes are rebuilt."""
+    _, _, alerts = _seed_txns_and_run(
+        tmp_path, fresh_db, config_overrides={"run_rules": {"rebuild_indexes": True}}
+    )
+    assert alerts == 3
+    with session_scope() as session:
+        names = session.execute(
+            text("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'alerts'")
+        ).scalars()
+        assert "ix_alerts_correlation_id" in set(names)
+        assert session.execute(
+            text("SELECT count(*) FROM sqlite_stat1 WHERE tbl = 'alerts'")
+        ).scalar_one()
+
+
+def test_run_rules_builds_one_ring_index_per_run(tmp_path, fresh_db, monkeypatch) -> None:
+    """run_rules opts network_ring into its per-run edge snapshot, built once across chunks."""
+    import aml_monitoring.rules.network_ring as network_ring
+
+    builds: list[int] = []
+    real_ring_index = network_ring.RingIndex
+
+    def counting_ring_index(session, lookback_days):
+        builds.append(lookback_days)
+        return real_ring_index(session, lookback_days)
+
+    monkeypatch.setattr(network_ring, "RingIndex", counting_ring_index)
+    _, processed, _ = _seed_txns_and_run(
+        tmp_path,
+        fresh_db,
+        chunk_size=2,
+        # Replaces the rules block: network_ring on, every other rule at its defaults.
+        config_overrides={"rules": {"network_ring": {"enabled": True}}},
+    )
+    assert processed == 3
+    assert builds == [30]
+
+
+def _rule_ctx() -> RuleContext:
+    return RuleContext(
+        transaction_id=1,
+        account_id=1,
+        customer_id=1,
+        ts=datetime.now(UTC),
+        amount=20_000.0,
+        currency="USD",
+        merchant=None,
+        counterparty=None,
+        country="IR",
+        channel=None,
+        direction=None,
+        session=SimpleNamespace(),
+    )
+
+
+def test_compiled_rule_dispatch_pairs_hits_with_rule_hash() -> None:
+    """evaluate_all yields (hit, rule_hash) in rule order for one or several enabled rules."""
+    ctx = _rule_ctx()
+    high_value = HighValueTransactionRule({"threshold_amount": 10_000})
+    country = HighRiskCountryRule({"countries": ["IR"]})
+    assert _compile_rule_dispatch([])(ctx) == []
+    single = _compile_rule_dispatch([high_value])(ctx)
+    assert [(h.rule_id, rh) for h, rh in single] == [
+        ("HighValueTransaction", high_value.get_rule_hash())
+    ]
+    both = _compile_rule_dispatch([high_value, country])(ctx)
+    assert [(h.rule_id, rh) for h, rh in both] == [
+        ("HighValueTransaction", high_value.get_rule_hash()),
+        ("HighRiskCountry", country.get_rule_hash()),
+    ]
+
+
+def test_compiled_rule_dispatch_drops_rules_that_never_fire() -> None:
+    """Enabled rules with an empty country/keyword list are left out of the plan."""
+    ctx = _rule_ctx()
+    empty_country = HighRiskCountryRule({"countries": []})
+    empty_keywords = SanctionsKeywordRule({"keywords": []})
+    assert empty_country.never_fires() and empty_keywords.never_fires()
+    assert not HighRiskCountryRule({"countries": ["IR"]}).never_fires()
+    empty_country.evaluate = empty_keywords.evaluate = None  # would raise if dispatched
+    assert _compile_rule_dispatch([empty_country, empty_keywords])(ctx) == []
+    high_value = HighValueTransactionRule({"threshold_amount": 10_000})
+    hits = _compile_rule_dispatch([empty_country, high_value, empty_keywords])(ctx)
+    assert [h.rule_id for h, _ in hits] == ["HighValueTransaction"]
+
+
+def test_compiled_rule_dispatch_stops_at_max_score() -> None:
+    """With stop_at_score, rules after the one that reaches it are not evaluated."""
+    ctx = _rule_ctx()
+    high_value = HighValueTransactionRule({"threshold_amount": 10_000, "score_delta": 60})
+    country = HighRiskCountryRule({"countries": ["IR"], "score_delta": 50})
+    hits = _compile_rule_dispatch([country, high_value], stop_at_score=100)(ctx)
+    assert [h.rule_id for h, _ in hits] == ["HighRiskCountry", "HighValueTransaction"]
+    hits = _compile_rule_dispatch([country, high_value], stop_at_score=50)(ctx)
+    assert [h.rule_id for h, _ in hits] == ["HighRiskCountry"]
+    assert HighValueTransactionRule.COST < HighRiskCountryRule.COST
+
+
+def test_compiled_rule_dispatch_counts_base_risk_toward_stop() -> None:
+    """The stop test uses base risk + deltas: base 40 + 60 already reaches a max_score of 100."""
+    ctx = _rule_ctx()
+    high_value = HighValueTransactionRule({"threshold_amount": 10_000, "score_delta": 60})
+    country = HighRiskCountryRule({"countries": ["IR"], "score_delta": 50})
+    evaluate_all = _compile_rule_dispatch([high_value, country], stop_at_score=100)
+    assert [h.rule_id for h, _ in evaluate_all(ctx)] == ["HighValueTransaction", "HighRiskCountry"]
+    assert [h.rule_id for h, _ in evaluate_all(ctx, 40.0)] == ["HighValueTransaction"]
+
+
+def test_compiled_rule_dispatch_no_stop_with_negative_delta(caplog) -> None:
+    """A rule with a negative score_delta could still lower the score, so nothing is skipped."""
+    ctx = _rule_ctx()
+    high_value = HighValueTransactionRule({"threshold_amount": 10_000, "score_delta": 60})
+    country = HighRiskCountryRule({"countries": ["IR"], "score_delta": -20})
+    with caplog.at_level("WARNING", logger="aml_monitoring.run_rules"):
+        evaluate_all = _compile_rule_dispatch([high_value, country], stop_at_score=50)
+    assert "HighRiskCountry" in caplog.text
+    assert [h.rule_id for h, _ in evaluate_all(ctx, 40.0)] == [
+        "HighValueTransaction",
+        "HighRiskCountry",
+    ]
+
+
+def test_alert_chunked_insert_flushes_every_chunksize_and_on_exit() -> None:
+    """Rows go out in chunksize executemany batches; the remainder is written on exit."""
+    batches: list[int] = []
+    session = SimpleNamespace(execute=lambda stmt, rows: batches.append(len(rows)))
+    with AlertChunkedInsert(session, chunksize=2) as writer:
+        for i in range(5):
+            writer.insert({"rule_id": f"R{i}"})
+        assert batches == [2, 2]
+    assert batches == [2, 2, 1]
+    assert writer.count == 5
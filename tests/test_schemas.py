@@ -1,11 +1,12 @@
 """Tests for Pydantic schemas."""
 
 from datetime import UTC, datetime
+from types import SimpleNamespace
 
 import pytest
 from pydantic import ValidationError
 
-from aml_monitoring.schemas import RuleHit, ScoreRequest, TransactionCreate
+from aml_monitoring.schemas import ALERT_LIST_ADAPTER, RuleHit, ScoreRequest, TransactionCreate
 
 
 def test_transaction_create_valid() -> None:
@@ -39,3 +40,27 @@ def test_rule_hit() -> None:
     h = RuleHit(rule_id="R1", severity="high", reason="test", score_delta=10.0)
     assert h.rule_id == "R1"
     assert h.evidence_fields is None
+
+
+def test_alert_list_adapter_reads_attributes() -> None:
+    """ALERT_LIST_ADAPTER validates ORM-like objects in one call, applying field validators."""
+    row = SimpleNamespace(
+        id=1,
+        transaction_id=2,
+        rule_id="HighValueTransaction",
+        severity="high",
+        score=25.0,
+        reason="r",
+        evidence_fields=None,
+        config_hash=None,
+        rules_version=None,
+        engine_version=None,
+        correlation_id=None,
+        status=None,
+        disposition=None,
+        created_at=datetime.now(UTC),
+        updated_at=None,
+    )
+    (alert,) = ALERT_LIST_ADAPTER.validate_python([row], from_attributes=True)
+    assert alert.id == 1
+    assert alert.status == "open"
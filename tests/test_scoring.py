@@ -1,10 +1,14 @@
 """Unit tests for scoring."""
 
+import numpy as np
+
 from aml_monitoring.schemas import RuleResult
 from aml_monitoring.scoring import (
     compute_transaction_risk,
+    compute_transaction_risks_bulk,
     normalize_score,
     score_band,
+    score_bands_bulk,
 )
 
 
@@ -42,3 +46,27 @@ def test_compute_transaction_risk() -> None:
     score, band = compute_transaction_risk(base, hits2, max_score=100)
     assert score == 70.0
     assert band == "high"
+
+
+def test_compute_transaction_risks_bulk_matches_scalar() -> None:
+    """Vectorized kernel agrees with compute_transaction_risk per row, including clamps."""
+    bases = np.array([10.0, 10.0, 10.0, 50.0, 0.0, 23.0])
+    delta_sums = np.array([0.0, 25.0, 60.0, 80.0, -5.0, 10.0])
+    scores, bands = compute_transaction_risks_bulk(bases, delta_sums, 100, 33, 66)
+    for base, delta, score, band in zip(bases, delta_sums, scores, bands, strict=True):
+        hits = [
+            RuleResult(
+                rule_id="R", severity="high", reason="x", evidence_fields=None, score_delta=delta
+            )
+        ]
+        assert (score, band) == compute_transaction_risk(base, hits, 100, 33, 66)
+    assert scores.tolist() == [10.0, 35.0, 70.0, 100.0, 0.0, 33.0]
+    assert bands.tolist() == ["low", "medium", "high", "high", "low", "medium"]
+
+
+def test_score_bands_bulk_matches_scalar() -> None:
+    """Array banding agrees with score_band(normalize_score(x)), boundaries included."""
+    raw = np.array([-10.0, 0.0, 32.9, 33.0, 65.99, 66.0, 100.0, 150.0])
+    expected = [score_band(normalize_score(x, 100), 33, 66) for x in raw]
+    assert score_bands_bulk(raw, 33, 66, 100).tolist() == expected
+    assert score_bands_bulk(np.array([50.0]), low=60, medium=90, max_score=40).tolist() == ["low"]
@@ -5,7 +5,6 @@ Covers rate limiting, CORS, security headers, input validation, and OpenAPI secu
 
 from __future__ import annotations
 
-import os
 from datetime import UTC, datetime
 from pathlib import Path
 
@@ -13,26 +12,24 @@ import pytest
 from fastapi.testclient import TestClient
 
 from aml_monitoring.api import app
-from aml_monitoring.config import get_config
-from aml_monitoring.db import init_db
 from aml_monitoring.security import reset_rate_limits
 
 AUTH_HEADERS = {"X-API-Key": "test_admin_key"}
 
 
 @pytest.fixture
-def secure_client(tmp_path: Path):
+def secure_client(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, fresh_db):
     """TestClient with security middleware active and very low rate limits for testing."""
     reset_rate_limits()
-    os.environ["AML_API_KEYS"] = "admin:test_admin_key"
-    db_file = tmp_path / "sec_test.db"
+    monkeypatch.setenv("AML_API_KEYS", "admin:test_admin_key")
+    db_url = fresh_db("sec_test.db")
     config_file = tmp_path / "sec_config.yaml"
     config_file.write_text(
         f"""
 app:
   log_level: INFO
 database:
-  url: "sqlite:///{db_file}"
+  url: "{db_url}"
   echo: false
 rules:
   high_value:
@@ -73,33 +70,25 @@ security:
     max_body_size_bytes: 1048576
 """
     )
-    os.environ["AML_CONFIG_PATH"] = str(config_file)
-    try:
-        cfg = get_config(str(config_file))
-        init_db(cfg["database"]["url"], echo=False)
-        yield TestClient(app)
-    finally:
-        os.environ.pop("AML_CONFIG_PATH", None)
-        os.environ.pop("AML_API_KEYS", None)
-        os.environ.pop("AML_RATE_LIMIT_READ", None)
-        os.environ.pop("AML_RATE_LIMIT_WRITE", None)
+    monkeypatch.setenv("AML_CONFIG_PATH", str(config_file))
+    return TestClient(app)
 
 
 @pytest.fixture
-def rate_limited_client(tmp_path: Path):
+def rate_limited_client(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, fresh_db):
     """TestClient with extremely low rate limits to trigger 429 in tests."""
     reset_rate_limits()
-    os.environ["AML_API_KEYS"] = "admin:test_admin_key"
-    os.environ["AML_RATE_LIMIT_READ"] = "2/minute"
-    os.environ["AML_RATE_LIMIT_WRITE"] = "1/minute"
-    db_file = tmp_path / "rl_test.db"
+    monkeypatch.setenv("AML_API_KEYS", "admin:test_admin_key")
+    monkeypatch.setenv("AML_RATE_LIMIT_READ", "2/minute")
+    monkeypatch.setenv("AML_RATE_LIMIT_WRITE", "1/minute")
+    db_url = fresh_db("rl_test.db")
     config_file = tmp_path / "rl_config.yaml"
     config_file.write_text(
         f"""
 app:
   log_level: INFO
 database:
-  url: "sqlite:///{db_file}"
+  url: "{db_url}"
   echo: false
 rules:
   high_value:
@@ -119,16 +108,8 @@ security:
     write_limit: "1/minute"
 """
     )
-    os.environ["AML_CONFIG_PATH"] = str(config_file)
-    try:
-        cfg = get_config(str(config_file))
-        init_db(cfg["database"]["url"], echo=False)
-        yield TestClient(app)
-    finally:
-        os.environ.pop("AML_CONFIG_PATH", None)
-        os.environ.pop("AML_API_KEYS", None)
-        os.environ.pop("AML_RATE_LIMIT_READ", None)
-        os.environ.pop("AML_RATE_LIMIT_WRITE", None)
+    monkeypatch.setenv("AML_CONFIG_PATH", str(config_file))
+    return TestClient(app)
 
 
 # ---------------------------------------------------------------------------
@@ -344,18 +325,17 @@ class TestAuthMessages:
         assert resp.status_code == 401
         assert "invalid" in resp.json()["detail"].lower() or "Invalid" in resp.json()["detail"]
 
-    def test_read_only_scope_message(self, secure_client: TestClient) -> None:
-        os.environ["AML_API_KEYS"] = "admin:test_admin_key,reader:ro_key:read_only"
-        try:
-            resp = secure_client.patch(
-                "/alerts/1",
-                json={"status": "closed"},
-                headers={"X-API-Key": "ro_key"},
-            )
-            assert resp.status_code == 403
-            assert "scope" in resp.json()["detail"].lower()
-        finally:
-            os.environ["AML_API_KEYS"] = "admin:test_admin_key"
+    def test_read_only_scope_message(
+        self, secure_client: TestClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("AML_API_KEYS", "admin:test_admin_key,reader:ro_key:read_only")
+        resp = secure_client.patch(
+            "/alerts/1",
+            json={"status": "closed"},
+            headers={"X-API-Key": "ro_key"},
+        )
+        assert resp.status_code == 403
+        assert "scope" in resp.json()["detail"].lower()
 
 
 # ---------------------------------------------------------------------------
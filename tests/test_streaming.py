@@ -393,6 +393,70 @@ class TestFileStreamConsumer:
         # Second consumer should produce 0 new alerts (idempotent ingest)
         assert consumer2.alert_count == 0
 
+    def test_consumer_builds_rules_once_per_config(self, tmp_path: Path, monkeypatch):
+        """Rules are built on the first message and reused while the config is unchanged."""
+        import aml_monitoring.rules as rules_module
+        from aml_monitoring.db import init_db
+
+        init_db("sqlite:///", echo=False)
+
+        jsonl_path = self._make_test_transactions(tmp_path, count=3)
+        cfg, cfg_path = self._make_test_config(tmp_path)
+        calls = []
+        real_get_all_rules = rules_module.get_all_rules
+
+        def counting_get_all_rules(config):
+            calls.append(1)
+            return real_get_all_rules(config)
+
+        monkeypatch.setattr(rules_module, "get_all_rules", counting_get_all_rules)
+
+        from aml_monitoring.streaming.consumer import FileStreamConsumer
+
+        consumer = FileStreamConsumer(input_path=jsonl_path, config=cfg, config_path=cfg_path)
+        consumer.consume(max_messages=3)
+
+        assert consumer.processed_count == 3
+        assert consumer.alert_count >= 3
+        assert len(calls) == 1
+
+    def test_consumer_network_ring_queries_one_account(self, tmp_path: Path, monkeypatch):
+        """Streamed messages use the targeted ring_signal queries, never a full RingIndex."""
+        import aml_monitoring.rules.network_ring as network_ring
+        from aml_monitoring.db import init_db
+
+        init_db("sqlite:///", echo=False)
+
+        jsonl_path = self._make_test_transactions(tmp_path, count=3)
+        cfg, cfg_path = self._make_test_config(tmp_path)
+        cfg["rules"]["network_ring"] = {"enabled": True}
+
+        def _no_index(*args, **kwargs):
+            raise AssertionError("stream consumer must not build a RingIndex")
+
+        calls = []
+        real_ring_signal = network_ring.ring_signal
+
+        def counting_ring_signal(account_id, session, lookback_days):
+            calls.append(account_id)
+            return real_ring_signal(account_id, session, lookback_days)
+
+        monkeypatch.setattr(network_ring, "RingIndex", _no_index)
+        monkeypatch.setattr(network_ring, "ring_signal", counting_ring_signal)
+
+        from aml_monitoring.streaming.consumer import FileStreamConsumer
+
+        consumer = FileStreamConsumer(input_path=jsonl_path, config=cfg)
+        consumer.consume(max_messages=3)
+
+        assert consumer.processed_count == 3
+        assert len(calls) == 3
+        # Rules stay cached across the messages; the per-message reset rebuilds nothing.
+        rule_ids = [rule.rule_id for rule in consumer._rules[1]]
+        assert "NetworkRingIndicator" in rule_ids
+        ring = consumer._rules[1][rule_ids.index("NetworkRingIndicator")]
+        assert ring._index is None
+
     def test_consumer_writes_processed_log(self, tmp_path: Path):
         """Verify commit() writes to processed file."""
         from aml_monitoring.db import init_db
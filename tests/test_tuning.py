@@ -2,19 +2,18 @@
 
 from pathlib import Path
 
+import numpy as np
 import pytest
 import yaml
 
-from aml_monitoring.db import init_db
 from aml_monitoring.ingest import ingest_csv
-from aml_monitoring.tuning import compute_tuned_config, train, write_tuned_config
+from aml_monitoring.tuning import _percentile, compute_tuned_config, train, write_tuned_config
 
 
 @pytest.fixture
-def tuning_db(tmp_path: Path) -> str:
-    db_url = f"sqlite:///{tmp_path / 'tune.db'}"
-    init_db(db_url, echo=False)
-    return db_url
+def tuning_db(fresh_db) -> str:
+    """Schema copied from the session template DB; no per-test DDL."""
+    return fresh_db("tune.db")
 
 
 @pytest.fixture
@@ -80,3 +79,12 @@ def test_write_tuned_config_creates_dir(tmp_path: Path) -> None:
     write_tuned_config({"rules": {"high_value": {"threshold_amount": 5000}}}, output_path=out)
     assert out.exists()
     assert "high_value" in yaml.safe_load(out.read_text()).get("rules", {})
+
+
+def test_percentile_nearest_rank_on_unsorted_values() -> None:
+    """_percentile picks sorted(values)[int(p * n)] without the caller sorting."""
+    values = np.array([700.0, 100000.0, 500.0, 600.0])
+    assert _percentile(values, 0.99) == 100000.0
+    assert _percentile(values, 0.5) == 700.0
+    assert _percentile(values, 0.0) == 500.0
+    assert _percentile(np.array([]), 0.9) == 0.0